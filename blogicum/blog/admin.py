@@ -1,15 +1,85 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import (
+    admin,
+    messages,
+)
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
 
+from . import moderation
 from .models import (
     Category,
     Comment,
+    ImageJob,
     Location,
     Post,
 )
+from .paginators import EstimatedCountPaginator
+from .search import get_backend
+
+
+class LargeTableAdminMixin:
+    """Списки большой таблицы: без второго COUNT(*) и с оценкой числа строк.
+
+    Сортировка по первичному ключу идёт по самой таблице. Для порядка из
+    Meta (дата публикации, дата комментария) полного индекса нет, и
+    каждая страница сортировала бы всю таблицу.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-pk',)
+
+
+class BulkDeleteMixin:
+    """Удаление выбранного частями вместо стандартного delete_selected.
+
+    delete_selected загружает каждый объект со всеми связанными, чтобы
+    вызвать сигналы и показать их список; здесь страница подтверждения
+    показывает только число строк.
+    """
+
+    bulk_delete = None
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    @admin.action(
+        permissions=['delete'], description='Удалить выбранные частями'
+    )
+    def delete_in_chunks(self, request, queryset):
+        if request.POST.get('post') != 'yes':
+            return TemplateResponse(
+                request,
+                'admin/blog/bulk_delete_confirmation.html',
+                {
+                    **self.admin_site.each_context(request),
+                    'title': 'Вы уверены?',
+                    'opts': self.model._meta,
+                    'count': queryset.count(),
+                    'action': 'delete_in_chunks',
+                    'selected': request.POST.getlist(
+                        helpers.ACTION_CHECKBOX_NAME
+                    ),
+                    'select_across': request.POST.get('select_across'),
+                },
+            )
+        deleted = self.bulk_delete(queryset)
+        self.message_user(request, f'Удалено: {deleted}.', messages.SUCCESS)
+
+
+class PostActionForm(helpers.ActionForm):
+    category = forms.ModelChoiceField(
+        Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(BulkDeleteMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'pub_date',
@@ -26,6 +96,56 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('category',)
     list_display_links = ('title',)
+    list_select_related = ('author', 'category')
+    raw_id_fields = ('author',)
+    action_form = PostActionForm
+    actions = ('publish', 'unpublish', 'recategorize', 'delete_in_chunks')
+    bulk_delete = staticmethod(moderation.delete_posts)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        if db_field.name in self.list_editable:
+            # Формы строк списка копируют варианты, а не читают их
+            # из БД заново для каждой строки.
+            formfield.choices = list(formfield.choices)
+        return formfield
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return get_backend().filter_posts(queryset, search_term), False
+
+    @admin.action(permissions=['change'], description='Опубликовать')
+    def publish(self, request, queryset):
+        done = moderation.set_published(queryset, True)
+        self.message_user(request, f'Опубликовано: {done}.', messages.SUCCESS)
+
+    @admin.action(permissions=['change'], description='Снять с публикации')
+    def unpublish(self, request, queryset):
+        done = moderation.set_published(queryset, False)
+        self.message_user(
+            request, f'Снято с публикации: {done}.', messages.SUCCESS
+        )
+
+    @admin.action(
+        permissions=['change'], description='Перенести в выбранную категорию'
+    )
+    def recategorize(self, request, queryset):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        category = form.is_valid() and form.cleaned_data['category']
+        if not category:
+            self.message_user(
+                request, 'Выберите категорию рядом с действием.',
+                messages.ERROR,
+            )
+            return
+        done = moderation.set_category(queryset, category)
+        self.message_user(
+            request, f'Перенесено в «{category}»: {done}.', messages.SUCCESS
+        )
 
 
 @admin.register(Category)
@@ -52,7 +172,7 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(BulkDeleteMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         'text',
         'created_at',
@@ -60,3 +180,39 @@ class CommentAdmin(admin.ModelAdmin):
         'post',
     )
     search_fields = ('text',)
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
+    actions = ('delete_in_chunks',)
+    bulk_delete = staticmethod(moderation.delete_comments)
+
+    def get_queryset(self, request):
+        # __str__ комментария выводит пост и автора: заголовок формы,
+        # история и журнал действий читают их вместе с комментарием.
+        return super().get_queryset(request).select_related('author', 'post')
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return get_backend().filter_comments(queryset, search_term), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'post' in form.changed_data:
+            Post.objects.filter(
+                pk__in=(form.initial['post'], obj.post_id)
+            ).sync_comment_count()
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'post',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at',
+    )
+    list_filter = ('status',)
+    list_select_related = ('post',)
+    raw_id_fields = ('post',)
+    readonly_fields = ('last_error',)
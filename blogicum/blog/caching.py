@@ -0,0 +1,144 @@
+import hashlib
+
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.db.models import Min
+from django.utils import timezone
+
+from core.db_router import reads_from_replica
+from core.models import cache_key
+
+from .models import Post
+
+VERSION_KEY = 'version:{label}:{pk}'
+SCHEDULE_KEY = 'feed-schedule'
+
+
+def version_key(label, pk):
+    return VERSION_KEY.format(label=label, pk=pk)
+
+
+def bump_version(label, pk):
+    """Выдаёт объекту новую версию, устаревшие фрагменты больше не читаются."""
+    cache.set(version_key(label, pk), uuid4().hex, None)
+
+
+def bump_versions(label, pks):
+    """Новые версии сразу многим объектам, за одно обращение к кэшу."""
+    cache.set_many({version_key(label, pk): uuid4().hex for pk in pks}, None)
+
+
+def get_versions(keys):
+    """Возвращает версии по ключам за одно обращение к кэшу.
+
+    Отсутствующие версии (после очистки кэша) создаются заново.
+    """
+    versions = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return versions
+
+
+def attach_card_versions(page):
+    """Проставляет постам страницы post.card_version для ключа фрагмента.
+
+    Версия карточки складывается из версий строк поста, категории и
+    местоположения в БД и версии автора в кэше, поэтому правка любого
+    из них сбрасывает кэш.
+    """
+    page.object_list = posts = list(page.object_list)
+    user_keys = {
+        post.pk: version_key('user', post.author_id) for post in posts
+    }
+    versions = get_versions(list(set(user_keys.values())))
+    for post in posts:
+        post.card_version = cache_key(
+            versions[user_keys[post.pk]], post, post.category, post.location
+        )
+
+
+def card_cache_timeout():
+    """Время жизни фрагмента карточки; 0 — не сохранять его.
+
+    Карточка из реплики может нести старое имя автора под уже новой
+    версией пользователя, поэтому такие карточки только читаются.
+    """
+    if reads_from_replica():
+        return 0
+    return settings.POST_CARD_CACHE_TIMEOUT
+
+
+def schedule_version():
+    """Версия публичных лент с учётом отложенных публикаций.
+
+    Вместе с версией хранится водяной знак — дата ближайшего отложенного
+    поста. Пока он не наступил, результаты лент с фильтром
+    pub_date__lte=now() не меняются и их можно брать из кэша. Когда
+    водяной знак пройден, версия и знак вычисляются заново, всегда по
+    основной БД: реплика может не знать о новом отложенном посте.
+    """
+    schedule = cache.get(SCHEDULE_KEY)
+    now = timezone.now()
+    if schedule is None or (
+        schedule['next_pub_date'] is not None
+        and schedule['next_pub_date'] <= now
+    ):
+        schedule = {
+            'version': uuid4().hex,
+            'next_pub_date': Post.objects.db_manager(
+                router.db_for_write(Post)
+            ).filter(
+                is_published=True, pub_date__gt=now
+            ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date'],
+        }
+        cache.set(SCHEDULE_KEY, schedule, None)
+    return schedule['version']
+
+
+def reset_schedule():
+    cache.delete(SCHEDULE_KEY)
+
+
+def feed_cache_key(feed, public=False):
+    """Префикс ключей кэша ленты.
+
+    Лента хранится под своей версией, публичные ленты — ещё и под
+    версией расписания отложенных публикаций.
+    """
+    key = version_key('feed', feed)
+    parts = ['feed', feed, get_versions([key])[key]]
+    if public:
+        parts.append(schedule_version())
+    return ':'.join(parts)
+
+
+def bump_feeds(category_ids=(), author_ids=()):
+    """Сбрасывает кэш главной ленты и лент категорий и авторов."""
+    bump_versions('feed', [
+        'index',
+        *(f'category:{pk}' for pk in category_ids),
+        *(f'author:{pk}' for pk in author_ids),
+    ])
+
+
+def bump_page_validators(name):
+    """Меняет ETag страниц, которые показывают данные из `name`.
+
+    comments — число комментариев на карточках лент; labels — названия
+    категорий и местоположений, имена пользователей.
+    """
+    bump_version('etag', name)
+
+
+def make_etag(version_keys, *parts):
+    """Слабый ETag из версий в кэше и прочих частей, без запросов к БД."""
+    versions = get_versions(version_keys)
+    raw = '|'.join(
+        [*(versions[key] for key in version_keys), *map(str, parts)]
+    )
+    return f'W/"{hashlib.md5(raw.encode()).hexdigest()}"'
@@ -0,0 +1,265 @@
+import logging
+import re
+import threading
+
+from datetime import timedelta
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from PIL import (
+    Image,
+    ImageOps,
+)
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import (
+    F,
+    Q,
+)
+from django.utils import timezone
+
+from .caching import bump_version
+from .models import (
+    ImageJob,
+    ImageStatus,
+    Post,
+)
+from .tasks import enqueue
+
+logger = logging.getLogger(__name__)
+
+# Расширение файла, формат Pillow и параметры кодирования.
+DERIVATIVE_FORMATS = (
+    ('jpg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+)
+
+
+# Имена файлов ContentAddressedStorage: <ab>/<sha256>.<ext>.
+DIGEST_DIRECTORY = re.compile(r'[0-9a-f]{2}')
+DIGEST_FILENAME = re.compile(r'[0-9a-f]{64}(\.\w+)?')
+
+
+def derivative_name(name, width, ext):
+    """Имя уменьшенной копии: <папка>/thumbs/<имя>_<ширина>.<ext>."""
+    path = PurePosixPath(name)
+    return str(path.parent / 'thumbs' / f'{path.stem}_{width}.{ext}')
+
+
+def derivative_names(name):
+    return [
+        derivative_name(name, width, ext)
+        for width in settings.POST_IMAGE_WIDTHS
+        for ext, _, _ in DERIVATIVE_FORMATS
+    ]
+
+
+def generate_derivatives(image):
+    """Создаёт для файла изображения копии всех ширин в JPEG и WebP.
+
+    Копии лежат в обычном хранилище под именами от имени оригинала,
+    а оно уже содержит хеш содержимого.
+    """
+    storage = default_storage
+    with image.storage.open(image.name) as source:
+        original = ImageOps.exif_transpose(Image.open(source))
+        original = original.convert('RGB')
+    for width in settings.POST_IMAGE_WIDTHS:
+        resized = original.copy()
+        # Увеличивать маленькие изображения не нужно.
+        resized.thumbnail((width, width * 4))
+        for ext, image_format, options in DERIVATIVE_FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            name = derivative_name(image.name, width, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def strip_metadata(image):
+    """Пересохраняет оригинал без EXIF (в том числе без координат).
+
+    Возвращает новое имя файла или None, если метаданных не было.
+    """
+    storage = image.storage
+    with storage.open(image.name) as source:
+        original = Image.open(source)
+        if not original.getexif():
+            return None
+        image_format = original.format
+        cleaned = ImageOps.exif_transpose(original)
+        if image_format == 'JPEG':
+            cleaned = cleaned.convert('RGB')
+    buffer = BytesIO()
+    cleaned.save(buffer, image_format, quality=95)
+    return storage.save(image.name, ContentFile(buffer.getvalue()))
+
+
+def _in_use(name):
+    return Post.objects.filter(image=name).exists()
+
+
+def release_image(name):
+    """Удаляет файл фото и его копии, если на него не ссылается ни один пост.
+
+    Одинаковые загрузки хранятся одним файлом, поэтому число ссылок на
+    файл — это число постов с таким Post.image. Файл, загруженный заново
+    меньше IMAGE_ORPHAN_GRACE секунд назад, остаётся до следующей сборки
+    collect_orphan_images. Возвращает True, если файл удалён.
+    """
+    if not name or _in_use(name):
+        return False
+    storage = Post._meta.get_field('image').storage
+    if not storage.delete_unused(name, _in_use, settings.IMAGE_ORPHAN_GRACE):
+        return False
+    for derivative in derivative_names(name):
+        default_storage.delete(derivative)
+    return True
+
+
+def release_image_on_commit(name):
+    if name:
+        transaction.on_commit(lambda: release_image(name))
+
+
+def collect_orphan_images():
+    """Удаляет файлы фото, на которые не ссылается ни один пост.
+
+    Подбирает то, что release_image оставил из-за недавней повторной
+    загрузки. Возвращает число удалённых файлов.
+    """
+    field = Post._meta.get_field('image')
+    storage = field.storage
+    root = field.upload_to
+    if not storage.exists(root):
+        return 0
+    removed = 0
+    for directory in storage.listdir(root)[0]:
+        # Только каталоги хешей: рядом лежат thumbs/ и файлы, загруженные
+        # до адресации по содержимому, их не трогаем.
+        if not DIGEST_DIRECTORY.fullmatch(directory):
+            continue
+        names = [
+            f'{root}/{directory}/{filename}'
+            for filename in storage.listdir(f'{root}/{directory}')[1]
+            if DIGEST_FILENAME.fullmatch(filename)
+            and filename.startswith(directory)
+        ]
+        used = set(
+            Post.objects.filter(image__in=names)
+            .values_list('image', flat=True)
+        )
+        removed += sum(
+            release_image(name) for name in names if name not in used
+        )
+    return removed
+
+
+def process_post_image(post):
+    old_name = post.image.name
+    name = strip_metadata(post.image)
+    if name is not None and name != old_name:
+        # Имя меняется, только если фото не заменили, пока шла обработка.
+        swapped = Post.objects.filter(pk=post.pk, image=old_name).update(
+            image=name
+        )
+        release_image(old_name if swapped else name)
+        if not swapped:
+            return
+        post.image.name = name
+    generate_derivatives(post.image)
+
+
+def schedule_image_processing(post):
+    """Ставит фото поста в очередь на обработку.
+
+    Задача записывается в БД в той же транзакции, что и пост, а после
+    коммита сразу передаётся в локальный пул потоков. Если процесс
+    упадёт, задачу подберёт команда process_image_jobs.
+    """
+    job = ImageJob.objects.create(post=post)
+    # Карточка без готовых копий выглядит одинаково при любом статусе,
+    # кроме READY, поэтому версию строки не меняем.
+    Post.objects.filter(pk=post.pk).update(
+        image_status=ImageStatus.PENDING,
+        version=F('version'),
+        updated_at=F('updated_at'),
+    )
+    post.image_status = ImageStatus.PENDING
+    transaction.on_commit(lambda: enqueue(run_image_job, job.pk))
+    return job
+
+
+def _claim(job_id):
+    """Атомарно переводит задачу в работу; False, если её уже взяли."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT)
+    return bool(
+        ImageJob.objects.filter(
+            Q(status=ImageStatus.PENDING, run_after__lte=now)
+            | Q(status=ImageStatus.PROCESSING, updated_at__lt=stale),
+            pk=job_id,
+        ).update(
+            status=ImageStatus.PROCESSING,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+    )
+
+
+def _finish(job, status, error=''):
+    ImageJob.objects.filter(pk=job.pk).update(
+        status=status,
+        last_error=error,
+        run_after=job.run_after,
+        updated_at=timezone.now(),
+    )
+    if status != ImageStatus.PENDING:
+        Post.objects.filter(pk=job.post_id).update(image_status=status)
+        # Карточка могла попасть в кэш с оригиналом, пока копий не было.
+        bump_version('post', job.post_id)
+
+
+def run_image_job(job_id):
+    """Выполняет задачу; при ошибке повторяет с экспоненциальной паузой."""
+    if not _claim(job_id):
+        return
+    job = ImageJob.objects.select_related('post').get(pk=job_id)
+    if not job.post.image:
+        _finish(job, ImageStatus.READY)
+        return
+    try:
+        process_post_image(job.post)
+    except Exception as error:
+        logger.exception('Не удалось обработать фото поста %s', job.post_id)
+        if job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS:
+            _finish(job, ImageStatus.FAILED, repr(error))
+            return
+        delay = settings.IMAGE_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        job.run_after = timezone.now() + timedelta(seconds=delay)
+        _finish(job, ImageStatus.PENDING, repr(error))
+        if not settings.BACKGROUND_TASKS_EAGER:
+            timer = threading.Timer(delay, enqueue, (run_image_job, job_id))
+            timer.daemon = True
+            timer.start()
+        return
+    _finish(job, ImageStatus.READY)
+
+
+def run_due_image_jobs(limit=100):
+    """Выполняет готовые к запуску и зависшие задачи, возвращает число."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT)
+    job_ids = list(
+        ImageJob.objects.filter(
+            Q(status=ImageStatus.PENDING, run_after__lte=now)
+            | Q(status=ImageStatus.PROCESSING, updated_at__lt=stale)
+        ).values_list('pk', flat=True)[:limit]
+    )
+    for job_id in job_ids:
+        run_image_job(job_id)
+    return len(job_ids)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import collect_orphan_images
+
+
+class Command(BaseCommand):
+    help = 'Удаляет файлы фото, на которые не ссылается ни один пост.'
+
+    def handle(self, *args, **options):
+        removed = collect_orphan_images()
+        self.stdout.write(self.style.SUCCESS(f'Удалено файлов: {removed}'))
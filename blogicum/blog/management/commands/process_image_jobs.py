@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.images import (
+    run_due_image_jobs,
+    schedule_image_processing,
+)
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь фото постов, включая повторы и зависшие.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать готовые задачи и выйти.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--enqueue-missing',
+            action='store_true',
+            help='Поставить в очередь фото, которые ещё не обрабатывались.',
+        )
+
+    def handle(self, *args, **options):
+        if options['enqueue_missing']:
+            posts = Post.objects.exclude(image='').filter(image_status='')
+            for post in posts.iterator():
+                schedule_image_processing(post)
+        while True:
+            done = run_due_image_jobs()
+            if done:
+                self.stdout.write(f'Обработано задач: {done}')
+            if options['once']:
+                return
+            if not done:
+                time.sleep(options['interval'])
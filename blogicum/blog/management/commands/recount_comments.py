@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Сверяет Post.comment_count с реальным числом комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'post_ids',
+            nargs='*',
+            type=int,
+            help='Идентификаторы постов; по умолчанию — все посты.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if options['post_ids']:
+            posts = posts.filter(pk__in=options['post_ids'])
+        fixed = posts.sync_comment_count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
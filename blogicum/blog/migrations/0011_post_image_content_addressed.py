@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:07
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_image_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, storage=core.storage.ContentAddressedStorage(), upload_to='birthdays_images', verbose_name='Фото'),
+        ),
+    ]
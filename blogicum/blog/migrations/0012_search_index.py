@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """Создаёт индекс FTS5 и заполняет его существующими записями.
+
+    На других СУБД индекс не нужен: там работает поиск через icontains.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE blog_search USING fts5('
+        'title, text, post_id UNINDEXED, '
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    # Совпадение в заголовке весит больше, чем в тексте.
+    schema_editor.execute(
+        "INSERT INTO blog_search (blog_search, rank) "
+        "VALUES ('rank', 'bm25(10.0, 1.0)')"
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_search (rowid, title, text, post_id) '
+        'SELECT id * 2, title, text, id FROM blog_post'
+    )
+    schema_editor.execute(
+        'INSERT INTO blog_search (rowid, title, text, post_id) '
+        "SELECT id * 2 + 1, '', text, post_id FROM blog_comment"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_image_content_addressed'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,13 +1,59 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import (
+    Count,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.urls import reverse
+from django.utils import timezone
 
-from core.models import MetaModel
+from core.models import (
+    MetaModel,
+    MetaQuerySet,
+)
+from core.storage import post_image_storage
 
 User = get_user_model()
 
 
+class PostQuerySet(MetaQuerySet):
+
+    def published(self):
+        """Посты, видимые всем: опубликованные и не отложенные."""
+        return self.filter(
+            pub_date__lte=timezone.now(),
+            is_published=True,
+            category__is_published=True,
+        )
+
+    def sync_comment_count(self):
+        """Пересчитывает счётчик комментариев одним UPDATE.
+
+        Затрагивает только посты с расхождением, возвращает их количество.
+        """
+        actual = Coalesce(
+            Subquery(
+                Comment.objects.filter(post=OuterRef("pk"))
+                .order_by()
+                .values("post")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        return self.exclude(comment_count=actual).update(comment_count=actual)
+
+
+class ImageStatus(models.TextChoices):
+    PENDING = "pending", "Ожидает обработки"
+    PROCESSING = "processing", "Обрабатывается"
+    READY = "ready", "Готово"
+    FAILED = "failed", "Ошибка"
+
+
 class Post(MetaModel):
     title = models.CharField("Заголовок", max_length=settings.MAX_HEAD_LENGHT)
     text = models.TextField("Текст")
@@ -39,12 +85,74 @@ class Post(MetaModel):
         verbose_name="Категория",
         related_name="posts",
     )
-    image = models.ImageField("Фото", upload_to="birthdays_images", blank=True)
+    image = models.ImageField(
+        "Фото",
+        upload_to="birthdays_images",
+        storage=post_image_storage,
+        blank=True,
+        db_index=True,
+    )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False,
+    )
+    image_status = models.CharField(
+        "Обработка фото",
+        max_length=16,
+        choices=ImageStatus.choices,
+        blank=True,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    # Пишутся только UPDATE с F() и фоновыми задачами: обычное сохранение
+    # загруженного раньше поста не должно возвращать им старые значения.
+    DENORMALIZED_FIELDS = frozenset({"comment_count", "image_status"})
 
     class Meta:
         verbose_name = "публикация"
         verbose_name_plural = "Публикации"
         ordering = ("-pub_date",)
+        indexes = (
+            # Главная лента: опубликованные посты по убыванию даты.
+            models.Index(
+                fields=("-pub_date",),
+                name="post_published_pub_date_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Лента категории.
+            models.Index(
+                fields=("category", "-pub_date"),
+                name="post_category_pub_date_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Профиль автора, включая неопубликованные посты.
+            models.Index(
+                fields=("author", "-pub_date"),
+                name="post_author_pub_date_idx",
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and self.pk is not None
+            and not kwargs.get("force_insert")
+            and kwargs.get("update_fields") is None
+        ):
+            skipped = self.DENORMALIZED_FIELDS | self.get_deferred_fields()
+            # Обработка фото заменяет файл в БД на очищенный от EXIF,
+            # поэтому неизменённое имя фото тоже не записывается.
+            if self.image.name == getattr(self, "_loaded_image", None):
+                skipped |= {"image"}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse(
@@ -54,6 +162,14 @@ class Post(MetaModel):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Прежнее имя фото нужно, чтобы удалить файл, на который больше
+        # не ссылается ни один пост.
+        instance._loaded_image = dict(zip(field_names, values)).get("image")
+        return instance
+
 
 class Category(MetaModel):
     title = models.CharField("Заголовок", max_length=settings.MAX_HEAD_LENGHT)
@@ -62,7 +178,7 @@ class Category(MetaModel):
         "Идентификатор",
         unique=True,
         help_text=(
-            "Идентификатор страницы для URL;"
+            "Идентификатор страницы для URL; "
             "разрешены символы латиницы, цифры, дефис и подчёркивание."
         ),
     )
@@ -108,14 +224,54 @@ class Comment(models.Model):
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ("created_at",)
+        indexes = (
+            models.Index(
+                fields=("post", "created_at"),
+                name="comment_post_created_at_idx",
+            ),
+        )
 
     def __str__(self):
-        return (
-            f"Комменатрий к посту {self.post}: "
-            f"{self.text}. Автора: {self.author}"
-        )
+        return (f"Комменатрий к посту {self.post}: "
+                f"{self.text}. Автора: {self.author}")
 
     def get_absolute_url(self):
         return reverse(
             "blog:profile", kwargs={"username": self.author.username}
         )
+
+
+class ImageJob(models.Model):
+    """Задача фоновой обработки фото поста, переживает перезапуск."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="image_jobs",
+        verbose_name="Публикация",
+    )
+    status = models.CharField(
+        "Статус",
+        max_length=16,
+        choices=ImageStatus.choices,
+        default=ImageStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    run_after = models.DateTimeField("Не раньше", default=timezone.now)
+    created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+    updated_at = models.DateTimeField("Изменено", auto_now=True)
+
+    class Meta:
+        verbose_name = "обработка фото"
+        verbose_name_plural = "Обработка фото"
+        ordering = ("run_after",)
+        indexes = (
+            models.Index(
+                fields=("status", "run_after"),
+                name="imagejob_status_run_after_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"Фото поста {self.post_id}: {self.get_status_display()}"
@@ -0,0 +1,162 @@
+"""Массовая модерация постов и комментариев частями.
+
+Каждая часть выбранных строк меняется одним UPDATE или DELETE в своей
+транзакции. UPDATE обходит сигналы моделей, а удаление идёт внутри
+muted_signals(), поэтому счётчики комментариев, поисковый индекс, файлы
+фото и версии кэша приводятся в порядок здесь же, для каждой части.
+"""
+import logging
+
+from django.conf import settings
+from django.db import (
+    router,
+    transaction,
+)
+
+from .caching import (
+    bump_feeds,
+    bump_page_validators,
+    bump_versions,
+    reset_schedule,
+)
+from .images import release_image_on_commit
+from .models import (
+    Comment,
+    Post,
+)
+from .search import get_backend
+from .signals import muted_signals
+
+logger = logging.getLogger('blogicum.moderation')
+
+
+def chunked_ids(queryset, chunk_size=None):
+    """Первичные ключи выборки частями по возрастанию, без OFFSET.
+
+    Следующая часть начинается после последнего ключа предыдущей,
+    поэтому изменение самих строк не сдвигает выборку.
+    """
+    chunk_size = chunk_size or settings.MODERATION_CHUNK_SIZE
+    ids = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        page = ids if last is None else ids.filter(pk__gt=last)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def run_in_chunks(queryset, handle_chunk, label, progress=None):
+    """Применяет handle_chunk к частям выборки, возвращает число строк.
+
+    О ходе работы пишет в лог blogicum.moderation и вызывает
+    progress(done, total), если он передан.
+    """
+    total = queryset.count()
+    done = 0
+    for ids in chunked_ids(queryset):
+        with transaction.atomic(using=router.db_for_write(queryset.model)):
+            handle_chunk(ids)
+        done += len(ids)
+        logger.info('%s: %s из %s', label, done, total)
+        if progress is not None:
+            progress(done, total)
+    return done
+
+
+def _post_feeds(ids):
+    rows = Post.objects.filter(pk__in=ids).values_list(
+        'category_id', 'author_id'
+    ).distinct()
+    categories = {category for category, _ in rows if category is not None}
+    return categories, {author for _, author in rows}
+
+
+def _invalidate_posts_on_commit(ids, categories, authors):
+    def invalidate():
+        bump_versions('post', ids)
+        bump_feeds(categories, authors)
+        reset_schedule()
+
+    transaction.on_commit(invalidate)
+
+
+def set_published(queryset, is_published, progress=None):
+    """Публикует или снимает с публикации выбранные посты."""
+    def handle_chunk(ids):
+        categories, authors = _post_feeds(ids)
+        Post.objects.filter(pk__in=ids).exclude(
+            is_published=is_published
+        ).update(is_published=is_published)
+        _invalidate_posts_on_commit(ids, categories, authors)
+
+    label = 'Публикация' if is_published else 'Снятие с публикации'
+    return run_in_chunks(queryset, handle_chunk, label, progress)
+
+
+def set_category(queryset, category, progress=None):
+    """Переносит выбранные посты в другую категорию."""
+    def handle_chunk(ids):
+        categories, authors = _post_feeds(ids)
+        Post.objects.filter(pk__in=ids).exclude(
+            category=category
+        ).update(category=category)
+        _invalidate_posts_on_commit(ids, {*categories, category.pk}, authors)
+
+    return run_in_chunks(queryset, handle_chunk, 'Смена категории', progress)
+
+
+def delete_posts(queryset, progress=None):
+    """Удаляет выбранные посты вместе с комментариями и задачами фото."""
+    using = router.db_for_write(Post)
+
+    def handle_chunk(ids):
+        categories, authors = _post_feeds(ids)
+        images = set(
+            Post.objects.filter(pk__in=ids).exclude(image='')
+            .values_list('image', flat=True)
+        )
+        # Сигналы на каждую строку заменяет код ниже. У спам-постов
+        # бывают сотни тысяч комментариев, они удаляются частями.
+        comments = Comment.objects.filter(post_id__in=ids)
+        with muted_signals():
+            for comment_ids in chunked_ids(comments):
+                get_backend().remove_many(
+                    comment_ids=comment_ids, using=using
+                )
+                Comment.objects.filter(pk__in=comment_ids).delete()
+            get_backend().remove_many(post_ids=ids, using=using)
+            # Задачи фото удаляются каскадом.
+            Post.objects.filter(pk__in=ids).delete()
+        for name in images:
+            release_image_on_commit(name)
+        _invalidate_posts_on_commit(ids, categories, authors)
+
+    return run_in_chunks(queryset, handle_chunk, 'Удаление постов', progress)
+
+
+def delete_comments(queryset, progress=None):
+    """Удаляет выбранные комментарии и пересчитывает счётчики постов."""
+    using = router.db_for_write(Comment)
+
+    def handle_chunk(ids):
+        post_ids = set(
+            Comment.objects.filter(pk__in=ids)
+            .values_list('post_id', flat=True)
+        )
+        get_backend().remove_many(comment_ids=ids, using=using)
+        with muted_signals():
+            Comment.objects.filter(pk__in=ids).delete()
+        Post.objects.filter(pk__in=post_ids).sync_comment_count()
+
+        def invalidate():
+            bump_versions('post', post_ids)
+            bump_page_validators('comments')
+
+        transaction.on_commit(invalidate)
+
+    return run_in_chunks(
+        queryset, handle_chunk, 'Удаление комментариев', progress
+    )
@@ -0,0 +1,279 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import (
+    InvalidPage,
+    Paginator,
+)
+from django.db import connections
+from django.db.models import (
+    Max,
+    Q,
+)
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from core.db_router import reads_from_replica
+
+
+def encode_cursor(direction, position):
+    """Упаковывает направление и позицию (дата, id) в непрозрачный токен."""
+    pub_date, pk = position
+    raw = f'{direction}|{pub_date.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковывает токен курсора. Бросает InvalidPage при ошибке."""
+    try:
+        raw = base64.urlsafe_b64decode(
+            token + '=' * (-len(token) % 4)
+        ).decode()
+        direction, pub_date, pk = raw.split('|')
+        position = (parse_datetime(pub_date), int(pk))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidPage('Некорректный курсор.')
+    if direction not in ('n', 'p') or position[0] is None:
+        raise InvalidPage('Некорректный курсор.')
+    return direction, position
+
+
+class CachedPaginator(Paginator):
+    """Paginator, который хранит в кэше число объектов и состав страниц.
+
+    COUNT(*) и поиск границ страницы выполняются один раз на версию
+    ленты, входящую в `cache_key`, а не на каждый просмотр.
+    Прочитанное из реплики в кэш не пишется: она может отставать, а
+    версия ленты уже сброшена записью в основную БД.
+    """
+
+    def __init__(self, *args, cache_key=None, cache_timeout=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.cache_timeout = cache_timeout
+
+    @cached_property
+    def fills_cache(self):
+        return not reads_from_replica()
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        key = f'{self.cache_key}:count'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            if self.fills_cache:
+                cache.set(key, count, self.cache_timeout)
+        return count
+
+    def page(self, number):
+        """Страница по кэшированному списку id.
+
+        Сами записи перечитываются по первичному ключу: состав и порядок
+        страницы берутся из кэша, а счётчики и тексты всегда свежие.
+        """
+        if self.cache_key is None:
+            return super().page(number)
+        number = self.validate_number(number)
+        key = f'{self.cache_key}:page:{number}'
+        ids = cache.get(key)
+        if ids is None:
+            bottom = (number - 1) * self.per_page
+            object_list = list(
+                self.object_list[bottom:bottom + self.per_page]
+            )
+            if self.fills_cache:
+                cache.set(
+                    key, [obj.pk for obj in object_list], self.cache_timeout
+                )
+        else:
+            object_list = list(self.object_list.filter(pk__in=ids))
+        return self._get_page(object_list, number, self)
+
+
+def estimate_count(queryset):
+    """Оценка числа строк таблицы без полного прохода по ней.
+
+    PostgreSQL хранит её в статистике планировщика, в остальных базах
+    берётся наибольший первичный ключ: это поиск по индексу, а
+    удалённые строки лишь немного завышают оценку.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    return queryset.model._default_manager.using(queryset.db).aggregate(
+        estimate=Max('pk')
+    )['estimate'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator админки с оценкой числа строк для больших таблиц.
+
+    Точный COUNT(*) выполняется для отфильтрованных списков и для
+    таблиц меньше ADMIN_EXACT_COUNT_LIMIT строк.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset)
+            if estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class CursorPage:
+    """Страница курсорной пагинации, совместимая с шаблонами ListView."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor, paginator):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по паре (pub_date, id) в порядке убывания.
+
+    Стоимость любой страницы равна стоимости первой: вместо OFFSET
+    запрос начинается с условия по индексируемым полям.
+    """
+
+    date_field = 'pub_date'
+    descending = True
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def _position(self, obj):
+        return getattr(obj, self.date_field), obj.pk
+
+    def _ordering(self, forward):
+        prefix = '-' if forward == self.descending else ''
+        return f'{prefix}{self.date_field}', f'{prefix}id'
+
+    def _beyond(self, position, forward):
+        date, pk = position
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return (
+            Q(**{f'{self.date_field}__{lookup}': date})
+            | Q(**{self.date_field: date, f'id__{lookup}': pk})
+        )
+
+    def page(self, cursor=None):
+        forward = True
+        queryset = self.queryset
+        if cursor:
+            direction, position = decode_cursor(cursor)
+            forward = direction == 'n'
+            queryset = queryset.filter(self._beyond(position, forward))
+        queryset = queryset.order_by(*self._ordering(forward))
+        # Лишняя запись показывает, есть ли что-то за границей страницы.
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if not forward:
+            object_list.reverse()
+        if not object_list:
+            return CursorPage([], None, None, self)
+        first = self._position(object_list[0])
+        last = self._position(object_list[-1])
+        if forward:
+            has_next, has_previous = has_more, bool(cursor)
+        else:
+            has_next, has_previous = True, has_more
+        return CursorPage(
+            object_list,
+            encode_cursor('n', last) if has_next else None,
+            encode_cursor('p', first) if has_previous else None,
+            self,
+        )
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Keyset-пагинация комментариев по (created_at, id) по возрастанию."""
+
+    date_field = 'created_at'
+    descending = False
+
+
+class SearchPaginator:
+    """Keyset-пагинация результатов поиска по паре (релевантность, id).
+
+    Позиция берётся из выдачи бэкенда поиска, страница посты
+    перечитывает одним запросом по первичному ключу. Переход возможен
+    только вперёд: назад ведёт история браузера.
+    """
+
+    def __init__(self, queryset, per_page, query, backend):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.query = query
+        self.backend = backend
+
+    @staticmethod
+    def encode_cursor(position):
+        score, pk = position
+        raw = f'{score!r}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token):
+        try:
+            raw = base64.urlsafe_b64decode(
+                token + '=' * (-len(token) % 4)
+            ).decode()
+            score, pk = raw.split('|')
+            return float(score), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidPage('Некорректный курсор.')
+
+    def page(self, cursor=None):
+        after = self.decode_cursor(cursor) if cursor else None
+        hits = self.backend.search(
+            self.query, self.queryset, after=after, limit=self.per_page + 1
+        )
+        has_next = len(hits) > self.per_page
+        hits = hits[:self.per_page]
+        posts = self.queryset.in_bulk([pk for _, pk in hits])
+        object_list = [posts[pk] for _, pk in hits if pk in posts]
+        return CursorPage(
+            object_list,
+            self.encode_cursor(hits[-1]) if has_next else None,
+            None,
+            self,
+        )
@@ -0,0 +1,223 @@
+"""Полнотекстовый поиск по постам и комментариям.
+
+Бэкенд выбирается настройкой SEARCH_BACKEND. По умолчанию на SQLite
+используется индекс FTS5, на остальных СУБД — поиск через icontains.
+"""
+import re
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+SEARCH_TABLE = 'blog_search'
+REMOVE_BATCH_SIZE = 500
+WORD_RE = re.compile(r'\w+')
+
+
+def parse_words(query):
+    """Слова запроса без знаков препинания и операторов."""
+    return WORD_RE.findall(query or '')
+
+
+def get_backend():
+    """Экземпляр бэкенда поиска из SEARCH_BACKEND."""
+    path = settings.SEARCH_BACKEND
+    if path is None:
+        if connections[DEFAULT_DB_ALIAS].vendor == 'sqlite':
+            path = 'blog.search.SQLiteFTSBackend'
+        else:
+            path = 'blog.search.SearchBackend'
+    return import_string(path)()
+
+
+class SearchBackend:
+    """Поиск без индекса: LIKE по заголовку, тексту и комментариям.
+
+    Ранжирования нет, посты идут по возрастанию id. Подходит для СУБД,
+    у которых нет своего полнотекстового индекса в проекте.
+    """
+
+    def index_post(self, post, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def index_comment(self, comment, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def remove_post(self, post, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def remove_comment(self, comment, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def remove_many(self, post_ids=(), comment_ids=(), using=DEFAULT_DB_ALIAS):
+        """Убирает из индекса посты и комментарии по id одним запросом."""
+        pass
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        pass
+
+    def search(self, query, posts, after=None, limit=None):
+        """Пары (score, post_id) в порядке выдачи, строго после `after`.
+
+        `posts` — queryset видимых постов, чужие результаты в выдачу
+        не попадают.
+        """
+        from .models import Comment
+
+        words = parse_words(query)
+        if not words:
+            return []
+        for word in words:
+            posts = posts.filter(
+                Q(title__icontains=word)
+                | Q(text__icontains=word)
+                | Q(pk__in=Comment.objects.filter(
+                    text__icontains=word
+                ).values('post'))
+            )
+        if after is not None:
+            posts = posts.filter(pk__gt=after[1])
+        ids = posts.order_by('pk').values_list('pk', flat=True)[:limit]
+        return [(0.0, pk) for pk in ids]
+
+    def filter_posts(self, queryset, query):
+        for word in parse_words(query):
+            queryset = queryset.filter(
+                Q(title__icontains=word) | Q(text__icontains=word)
+            )
+        return queryset
+
+    def filter_comments(self, queryset, query):
+        for word in parse_words(query):
+            queryset = queryset.filter(text__icontains=word)
+        return queryset
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """Поиск по виртуальной таблице FTS5 с ранжированием bm25.
+
+    Пост хранится в строке с rowid = 2 * id, комментарий — с
+    rowid = 2 * id + 1, поэтому обновление и удаление идут по rowid,
+    без сканирования индекса. Пост ранжируется по лучшему совпадению
+    среди своего текста и комментариев.
+    """
+
+    def _execute(self, using, sql, params):
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def _write(self, using, rowid, title, text, post_id):
+        self._execute(
+            using,
+            f'INSERT OR REPLACE INTO {SEARCH_TABLE} '
+            '(rowid, title, text, post_id) VALUES (%s, %s, %s, %s)',
+            (rowid, title, text, post_id),
+        )
+
+    def _delete(self, using, rowid):
+        self._execute(
+            using, f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', (rowid,)
+        )
+
+    def index_post(self, post, using=DEFAULT_DB_ALIAS):
+        self._write(using, post.pk * 2, post.title, post.text, post.pk)
+
+    def index_comment(self, comment, using=DEFAULT_DB_ALIAS):
+        self._write(
+            using, comment.pk * 2 + 1, '', comment.text, comment.post_id
+        )
+
+    def remove_post(self, post, using=DEFAULT_DB_ALIAS):
+        self._delete(using, post.pk * 2)
+
+    def remove_comment(self, comment, using=DEFAULT_DB_ALIAS):
+        self._delete(using, comment.pk * 2 + 1)
+
+    def remove_many(self, post_ids=(), comment_ids=(), using=DEFAULT_DB_ALIAS):
+        rowids = [
+            *(pk * 2 for pk in post_ids),
+            *(pk * 2 + 1 for pk in comment_ids),
+        ]
+        # Комментариев у части постов может быть больше, чем SQLite
+        # принимает параметров в одном запросе.
+        for start in range(0, len(rowids), REMOVE_BATCH_SIZE):
+            batch = rowids[start:start + REMOVE_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            self._execute(
+                using,
+                f'DELETE FROM {SEARCH_TABLE} '
+                f'WHERE rowid IN ({placeholders})',
+                batch,
+            )
+
+    def rebuild(self, using=DEFAULT_DB_ALIAS):
+        """Заполняет индекс заново из таблиц постов и комментариев."""
+        self._execute(using, f'DELETE FROM {SEARCH_TABLE}', ())
+        self._execute(
+            using,
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text, post_id) '
+            'SELECT id * 2, title, text, id FROM blog_post',
+            (),
+        )
+        self._execute(
+            using,
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text, post_id) '
+            "SELECT id * 2 + 1, '', text, post_id FROM blog_comment",
+            (),
+        )
+
+    @staticmethod
+    def match_expression(query):
+        """Все слова запроса как префиксы; кавычки экранируют синтаксис."""
+        return ' '.join(f'"{word}"*' for word in parse_words(query))
+
+    def search(self, query, posts, after=None, limit=None):
+        match = self.match_expression(query)
+        if not match:
+            return []
+        # Видимость проверяется по первичному ключу для каждого
+        # найденного поста, а не перебором всех видимых постов.
+        visible, visible_params = (
+            posts.filter(pk=RawSQL('hits.post_id', ()))
+            .order_by()
+            .values('pk')
+            .query.sql_with_params()
+        )
+        sql = (
+            'SELECT hits.score, hits.post_id FROM ('
+            f'SELECT post_id, MIN(rank) AS score FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s GROUP BY post_id'
+            f') AS hits WHERE EXISTS ({visible})'
+        )
+        params = [match, *visible_params]
+        if after is not None:
+            sql += ' AND (hits.score, hits.post_id) > (%s, %s)'
+            params.extend(after)
+        sql += ' ORDER BY hits.score, hits.post_id'
+        if limit is not None:
+            sql += ' LIMIT %s'
+            params.append(limit)
+        with connections[posts.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def _matching(self, queryset, query, column, parity):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT {column} FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND rowid %% 2 = %s',
+            (match, parity),
+        ))
+
+    def filter_posts(self, queryset, query):
+        return self._matching(queryset, query, 'post_id', 0)
+
+    def filter_comments(self, queryset, query):
+        return self._matching(queryset, query, 'rowid / 2', 1)
@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import (
+    partial,
+    wraps,
+)
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from .caching import (
+    bump_feeds,
+    bump_page_validators,
+    bump_version,
+    reset_schedule,
+)
+from .images import (
+    release_image_on_commit,
+    schedule_image_processing,
+)
+from .models import (
+    Category,
+    Comment,
+    Location,
+    Post,
+)
+from .search import get_backend
+
+VERSIONED_MODELS = {
+    Post: 'post',
+    Category: 'category',
+    Location: 'location',
+    get_user_model(): 'user',
+}
+
+# Вход пользователя меняет только last_login, его нет на страницах.
+LOGIN_UPDATE_FIELDS = frozenset({'last_login'})
+
+_muted = ContextVar('blog_signals_muted', default=False)
+
+
+@contextmanager
+def muted_signals():
+    """Отключает обработчики этого модуля в текущем потоке или задаче.
+
+    Нужно массовым операциям, которые удаляют строки частями и сами
+    приводят в порядок счётчики, поисковый индекс, файлы и кэш: по
+    сигналу на каждую строку это было бы на порядки медленнее. Другие
+    запросы, в том числе параллельные, сигналы получают как обычно.
+    """
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+def unless_muted(handler):
+    """Обработчик сигнала, пропускаемый внутри muted_signals()."""
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not _muted.get():
+            return handler(*args, **kwargs)
+    return wrapper
+
+
+@receiver(post_save, sender=Comment)
+@unless_muted
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Увеличивает счётчик комментариев поста при создании комментария."""
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+@unless_muted
+def decrement_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик при удалении, в том числе массовом и из админки."""
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(comment_count=F('comment_count') - 1)
+
+
+def _cache_bumps(sender, instance, update_fields=None):
+    """Сбросы версий кэша после сохранения или удаления объекта."""
+    bumps = []
+    if sender is Comment:
+        bumps.append(partial(bump_version, 'post', instance.post_id))
+        bumps.append(partial(bump_page_validators, 'comments'))
+    elif sender in VERSIONED_MODELS:
+        bumps.append(
+            partial(bump_version, VERSIONED_MODELS[sender], instance.pk)
+        )
+    if sender in (Category, Location) or (
+        sender is get_user_model() and update_fields != LOGIN_UPDATE_FIELDS
+    ):
+        bumps.append(partial(bump_page_validators, 'labels'))
+    if sender is Post:
+        bumps.append(
+            partial(bump_feeds, [instance.category_id], [instance.author_id])
+        )
+    elif sender is Category:
+        bumps.append(partial(bump_feeds, [instance.pk]))
+    if sender in (Post, Category, Location):
+        bumps.append(reset_schedule)
+    return bumps
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@unless_muted
+def bump_cache_version(sender, instance, using, **kwargs):
+    """Сбрасывает кэш карточек при изменении связанных объектов.
+
+    Внутри транзакции версии меняются сразу, чтобы она сама не читала
+    кэш, заполненный до записи, и ещё раз после коммита: до него
+    параллельный запрос мог положить под новую версию старые данные.
+    """
+    bumps = _cache_bumps(sender, instance, kwargs.get('update_fields'))
+    if not bumps:
+        return
+
+    def invalidate():
+        for bump in bumps:
+            bump()
+
+    if transaction.get_connection(using).in_atomic_block:
+        invalidate()
+    transaction.on_commit(invalidate, using=using)
+
+
+@receiver(post_save, sender=Post)
+@unless_muted
+def process_replaced_image(sender, instance, raw=False, **kwargs):
+    """Ставит новое фото в очередь обработки, прежнее освобождает.
+
+    Срабатывает при любом сохранении с новым фото: из формы, админки
+    или кода.
+    """
+    loaded = getattr(instance, '_loaded_image', None)
+    if not raw and instance.image.name != loaded:
+        if loaded:
+            release_image_on_commit(loaded)
+        if instance.image:
+            schedule_image_processing(instance)
+    instance._loaded_image = instance.image.name
+
+
+@receiver(post_delete, sender=Post)
+@unless_muted
+def release_deleted_image(sender, instance, **kwargs):
+    """Освобождает файл фото удалённого поста, в том числе из админки."""
+    release_image_on_commit(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+@unless_muted
+def update_search_index(sender, instance, using, **kwargs):
+    """Переиндексирует пост или комментарий после сохранения."""
+    backend = get_backend()
+    if sender is Post:
+        backend.index_post(instance, using=using)
+    else:
+        backend.index_comment(instance, using=using)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@unless_muted
+def remove_from_search_index(sender, instance, using, **kwargs):
+    """Убирает из индекса удалённый пост или комментарий.
+
+    Комментарии удалённого поста уходят из индекса своими сигналами.
+    """
+    backend = get_backend()
+    if sender is Post:
+        backend.remove_post(instance, using=using)
+    else:
+        backend.remove_comment(instance, using=using)
@@ -0,0 +1,41 @@
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix='blog-worker',
+        )
+    return _executor
+
+
+def _run(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Фоновая задача %s упала', func.__name__)
+    finally:
+        # У каждого потока своё соединение с БД, закрываем его сами.
+        connections.close_all()
+
+
+def enqueue(func, *args):
+    """Выполняет задачу в локальном пуле потоков вне цикла запроса.
+
+    При BACKGROUND_TASKS_EAGER задача выполняется сразу, что удобно
+    в тестах и management-командах.
+    """
+    if settings.BACKGROUND_TASKS_EAGER:
+        return func(*args)
+    return _get_executor().submit(_run, func, *args)
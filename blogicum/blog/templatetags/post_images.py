@@ -0,0 +1,48 @@
+from django import template
+from django.conf import settings
+from django.utils.html import format_html
+
+from blog.images import derivative_name
+from blog.models import ImageStatus
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+def _srcset(image, ext):
+    storage = image.storage
+    return ', '.join(
+        f'{storage.url(derivative_name(image.name, width, ext))} {width}w'
+        for width in settings.POST_IMAGE_WIDTHS
+    )
+
+
+@register.simple_tag
+def post_picture(post, loading='lazy', sizes=DEFAULT_SIZES):
+    """Тег <picture> с WebP и JPEG разных ширин для фото поста.
+
+    Пока уменьшенные копии не готовы, отдаётся оригинал.
+    """
+    css = 'border-3 rounded img-fluid img-thumbnail mb-2 mx-auto d-block'
+    widths = settings.POST_IMAGE_WIDTHS
+    image = post.image
+    if post.image_status != ImageStatus.READY:
+        return format_html(
+            '<img class="{}" src="{}" loading="{}" alt="">',
+            css, image.url, loading,
+        )
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img class="{}" src="{}" srcset="{}" sizes="{}" '
+        'loading="{}" decoding="async" alt="">'
+        '</picture>',
+        _srcset(image, 'webp'), sizes,
+        css,
+        image.storage.url(
+            derivative_name(image.name, widths[len(widths) // 2], 'jpg')
+        ),
+        _srcset(image, 'jpg'), sizes,
+        loading,
+    )
@@ -1,15 +1,31 @@
+from django.conf import settings
 from django.urls import path
 
+from core.async_views import as_async_view
+
 from . import views
 
 app_name = 'blog'
 
+
+def read_view(view_class):
+    """Под ASGI страницы только для чтения работают асинхронно."""
+    if settings.ASYNC_READ_VIEWS:
+        return as_async_view(view_class)
+    return view_class.as_view()
+
+
 urlpatterns = [
     path(
         '',
-        views.IndexListView.as_view(),
+        read_view(views.IndexListView),
         name='index'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -17,9 +33,14 @@ urlpatterns = [
     ),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
+        read_view(views.PostDetailView),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
     path(
         'posts/<int:post_id>/edit/',
         views.PostUpdateView.as_view(),
@@ -47,12 +68,12 @@ urlpatterns = [
     ),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryListView.as_view(),
+        read_view(views.CategoryListView),
         name='category_posts'
     ),
     path(
         'profile/<str:username>/',
-        views.ProfileDetailView.as_view(),
+        read_view(views.ProfileDetailView),
         name='profile'
     ),
     path(
@@ -4,7 +4,8 @@ from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     UserPassesTestMixin,
 )
-from django.db.models import Count
+from django.core.paginator import InvalidPage
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import (
     get_object_or_404,
@@ -12,6 +13,7 @@ from django.shortcuts import (
 )
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -20,8 +22,16 @@ from django.views.generic import (
     UpdateView,
 )
 
+from core.db_router import reads_from_replica
 from users.forms import BlogicumUserChangeForm
 
+from .caching import (
+    attach_card_versions,
+    card_cache_timeout,
+    feed_cache_key,
+    make_etag,
+    version_key,
+)
 from .forms import (
     CommentForm,
     PostForm,
@@ -31,16 +41,40 @@ from .models import (
     Comment,
     Post,
 )
+from .paginators import (
+    CachedPaginator,
+    CommentCursorPaginator,
+    CursorPaginator,
+    SearchPaginator,
+)
+from .search import get_backend
 
 BlogicumUser = get_user_model()
 
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+class ObjectCacheMixin():
+    """Миксин: объект загружается из БД один раз за запрос.
+
+    Проверка прав и сам view получают один и тот же экземпляр.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return self.load_object(queryset)
+        if not hasattr(self, '_object_cache'):
+            self._object_cache = self.load_object()
+        return self._object_cache
+
+    def load_object(self, queryset=None):
+        return super().get_object(queryset)
+
+
+class OnlyAuthorMixin(ObjectCacheMixin, UserPassesTestMixin):
     """Класс для подмешивания проверки доступа."""
 
     def test_func(self):
         _obj = self.get_object()
-        return _obj.author == self.request.user
+        return _obj.author_id == self.request.user.pk
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_id=self.kwargs.get('post_id'))
@@ -55,12 +89,15 @@ class PostRedirectMixin:
         )
 
 
-class OnlyAuthorUpdateMixin():
+class OnlyAuthorUpdateMixin(ObjectCacheMixin):
     """Миксин для подмешивания проверки авторства и валидности данных."""
 
-    def get_object(self, queryset=None):
-        obj = get_object_or_404(Post, pk=self.kwargs.get('post_id'))
-        if obj.author == self.request.user:
+    def load_object(self, queryset=None):
+        obj = get_object_or_404(
+            Post.objects.select_related('author', 'category', 'location'),
+            pk=self.kwargs.get('post_id'),
+        )
+        if obj.author_id == self.request.user.pk:
             return obj
         if (
             obj.pub_date <= timezone.now()
@@ -71,23 +108,137 @@ class OnlyAuthorUpdateMixin():
         raise Http404
 
 
-class ListViewMixin():
+class ConditionalGetMixin():
+    """Миксин условного GET по ETag из версий объектов в кэше.
+
+    Если страница у клиента не устарела, view отвечает 304 без основного
+    запроса к БД и отрисовки шаблона. В ETag входят пользователь (от
+    него зависят шапка и кнопки автора), адрес с номером страницы и
+    ключ сессии: при новом входе меняются и он, и CSRF-токен, поэтому
+    закэшированная форма со старым токеном не вернётся.
+    """
+
+    def get_etag_version_keys(self):
+        return [version_key('etag', 'labels')]
+
+    def get_etag_parts(self):
+        """Прочие части ETag; None — у страницы нет валидатора."""
+        return []
+
+    def get_etag(self):
+        if reads_from_replica():
+            # Версии уже сброшены записью, а страница из реплики может
+            # быть старой: с новым ETag клиент хранил бы её и дальше.
+            return None
+        parts = self.get_etag_parts()
+        if parts is None:
+            return None
+        return make_etag(
+            self.get_etag_version_keys(),
+            *parts,
+            self.request.user.pk,
+            self.request.session.session_key,
+            self.request.get_full_path(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response.headers.setdefault('ETag', etag)
+        return response
+
+
+class CursorPaginationMixin():
+    """Миксин keyset-пагинации по непрозрачному курсору из запроса."""
+
+    cursor_kwarg = 'cursor'
+    cursor_paginator_class = CursorPaginator
+
+    def get_cursor_paginator(self, queryset, page_size):
+        return self.cursor_paginator_class(queryset, page_size)
+
+    def paginate_queryset_by_cursor(self, queryset, page_size):
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class ListViewMixin(ConditionalGetMixin, CursorPaginationMixin):
     """Класс для подмешивания спсика постов."""
 
     model = Post
     paginate_by = settings.MAX_POSTS_LIMIT
+    cursor_pagination = None
+
+    def use_cursor_pagination(self):
+        """Курсор из запроса важнее всего, старые ссылки ?page= работают."""
+        if self.cursor_kwarg in self.request.GET:
+            return True
+        enabled = self.cursor_pagination
+        if enabled is None:
+            enabled = settings.POSTS_CURSOR_PAGINATION
+        return enabled and self.page_kwarg not in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.use_cursor_pagination():
+            return self.paginate_queryset_by_cursor(queryset, page_size)
+        return super().paginate_queryset(queryset, page_size)
 
     def get_queryset(self):
         return Post.objects.select_related(
             'author', 'location', 'category'
-        ).annotate(
-            comment_count=Count('comments')
         ).order_by(*Post._meta.ordering)
 
+    feed_is_public = False
+
+    def get_feed_key(self):
+        """Имя ленты для кэша страниц; None — читать из БД без кэша."""
+        return None
+
+    def get_etag_version_keys(self):
+        return [
+            *super().get_etag_version_keys(),
+            version_key('etag', 'comments'),
+        ]
+
+    def get_etag_parts(self):
+        feed = self.get_feed_key()
+        if feed is None:
+            return None
+        return [feed_cache_key(feed, self.feed_is_public)]
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        feed = self.get_feed_key()
+        if feed is not None:
+            kwargs['cache_key'] = feed_cache_key(feed, self.feed_is_public)
+            kwargs['cache_timeout'] = settings.FEED_CACHE_TIMEOUT
+        return CachedPaginator(queryset, per_page, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        attach_card_versions(page)
+        context['card_cache_timeout'] = card_cache_timeout()
+        if not getattr(page, 'is_cursor', False):
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number,
+                on_each_side=settings.PAGINATOR_ON_EACH_SIDE,
+                on_ends=settings.PAGINATOR_ON_ENDS,
+            )
+        return context
+
 
 class ProfileDetailView(ListViewMixin, ListView):
     """Класс для отображения страницы пользователя."""
 
+    replica_reads = True
     user_obj = None
     template_name = 'blog/profile.html'
 
@@ -99,6 +250,9 @@ class ProfileDetailView(ListViewMixin, ListView):
     def get_queryset(self):
         return super().get_queryset().filter(author=self.user_obj.id)
 
+    def get_feed_key(self):
+        return f'author:{self.user_obj.pk}'
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.user_obj
@@ -120,14 +274,15 @@ class PostCreateView(LoginRequiredMixin, CreateView,):
 class IndexListView(OnlyAuthorUpdateMixin, ListViewMixin, ListView):
     """Класс для представления главной страницы."""
 
+    replica_reads = True
     template_name = 'blog/index.html'
+    feed_is_public = True
+
+    def get_feed_key(self):
+        return 'index'
 
     def get_queryset(self):
-        return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True
-        )
+        return super().get_queryset().published()
 
 
 class UserUpdateView(LoginRequiredMixin, UpdateView):
@@ -146,20 +301,52 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class PostDetailView(OnlyAuthorUpdateMixin, DetailView):
+class PostDetailView(ConditionalGetMixin, OnlyAuthorUpdateMixin, DetailView):
     """Класс для развёрнутого представения поста."""
 
+    replica_reads = True
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
     success_url = reverse_lazy('blog:index')
 
+    def get_etag_version_keys(self):
+        # Версия поста меняется и при правке его комментариев.
+        return [
+            *super().get_etag_version_keys(),
+            version_key('post', self.kwargs['post_id']),
+        ]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = Comment.objects.filter(
-            post=self.kwargs.get('post_id')
-        )
+        context['comments'] = CommentCursorPaginator(
+            self.object.comments.select_related('author'),
+            settings.MAX_COMMENTS_LIMIT,
+        ).page()
+        return context
+
+
+class CommentListView(
+    CursorPaginationMixin, OnlyAuthorUpdateMixin, ListView
+):
+    """Класс для догрузки комментариев к посту фрагментами HTML."""
+
+    template_name = 'includes/comment_list.html'
+    paginate_by = settings.MAX_COMMENTS_LIMIT
+    cursor_paginator_class = CommentCursorPaginator
+
+    def get_queryset(self):
+        self.object = self.get_object()
+        return self.object.comments.select_related('author')
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.paginate_queryset_by_cursor(queryset, page_size)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.object
+        context['comments'] = context['page_obj']
         return context
 
 
@@ -199,6 +386,7 @@ class CommentCreateView(PostRedirectMixin, LoginRequiredMixin, CreateView):
         self.post_model = get_object_or_404(Post, pk=kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
+    @transaction.atomic
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.post_model
@@ -222,14 +410,20 @@ class CommentDeleteView(PostRedirectMixin, OnlyAuthorMixin, DeleteView):
     form_class = CommentForm
     pk_url_kwarg = 'comment_id'
 
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        return super().delete(request, *args, **kwargs)
+
 
 class CategoryListView(ListViewMixin, ListView):
     """Класс для отображения категорий."""
 
+    replica_reads = True
     model = Category
     category = None
     template_name = 'blog/category.html'
     slug_url_kwarg = 'category_slug'
+    feed_is_public = True
 
     def dispatch(self, request, *args, **kwargs):
         self.category = get_object_or_404(
@@ -238,14 +432,46 @@ class CategoryListView(ListViewMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
+        return super().get_queryset().published().filter(
             category=self.category
         )
 
+    def get_feed_key(self):
+        return f'category:{self.category.pk}'
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         return context
+
+
+class SearchView(CursorPaginationMixin, ListView):
+    """Класс поиска по опубликованным постам и комментариям к ним."""
+
+    template_name = 'blog/search.html'
+    paginate_by = settings.MAX_POSTS_LIMIT
+    cursor_paginator_class = SearchPaginator
+    query_kwarg = 'q'
+
+    def get_queryset(self):
+        return Post.objects.published().select_related(
+            'author', 'location', 'category'
+        )
+
+    def get_cursor_paginator(self, queryset, page_size):
+        return self.cursor_paginator_class(
+            queryset, page_size, self.get_search_query(), get_backend()
+        )
+
+    def get_search_query(self):
+        return self.request.GET.get(self.query_kwarg, '').strip()
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.paginate_queryset_by_cursor(queryset, page_size)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        attach_card_versions(context['page_obj'])
+        context['card_cache_timeout'] = card_cache_timeout()
+        context['query'] = self.get_search_query()
+        return context
@@ -1,7 +1,14 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
+from core.template_warmup import warm_templates
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+os.environ.setdefault('BLOGICUM_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+if settings.TEMPLATES_WARMUP:
+    warm_templates()
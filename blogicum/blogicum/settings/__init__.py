@@ -0,0 +1,21 @@
+"""Настройки проекта: профиль выбирается переменной BLOGICUM_ENV.
+
+dev — локальная разработка (по умолчанию), prod — боевой сервер,
+bench — замеры производительности на локальной базе.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+BLOGICUM_ENV = os.environ.get('BLOGICUM_ENV', 'dev')
+
+if BLOGICUM_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif BLOGICUM_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif BLOGICUM_ENV == 'bench':
+    from .bench import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль настроек BLOGICUM_ENV={BLOGICUM_ENV!r}.'
+    )
@@ -0,0 +1,268 @@
+"""Общие настройки всех профилей: dev, prod и bench."""
+import os
+
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'django-insecure-+vd_cums4@6iz^%s74*swn#(ib@d2rvje19udwn5s*j6legvaq'
+
+# Коснтанты постов:
+# Максималная длинна заголовков.
+MAX_HEAD_LENGHT = 256
+
+# Лимит постов для выборки на главной странице.
+MAX_POSTS_LIMIT = 10
+
+# Курсорная (keyset) пагинация лент вместо постраничной по умолчанию.
+POSTS_CURSOR_PAGINATION = False
+
+# Количество комментариев на одной странице обсуждения поста.
+MAX_COMMENTS_LIMIT = 50
+
+# Путь к классу бэкенда поиска; None — FTS5 на SQLite, иначе icontains.
+SEARCH_BACKEND = None
+
+# Время жизни кэша отрисованных карточек постов, в секундах.
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Время жизни кэша страниц и счётчиков лент, в секундах. Кэш сбрасывается
+# при правках постов, категорий и мест и при выходе отложенного поста.
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Окно пагинатора: ссылок вокруг текущей страницы и по краям списка.
+PAGINATOR_ON_EACH_SIDE = 3
+PAGINATOR_ON_ENDS = 2
+
+# Списки админки без фильтров: если оценка числа строк больше порога,
+# она показывается вместо точного COUNT(*) по всей таблице.
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+# Размер части для массовых действий модерации в админке: столько
+# строк меняется одним UPDATE/DELETE в одной транзакции.
+MODERATION_CHUNK_SIZE = 500
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+]
+
+# Параметры страниц с ошибками.
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+# Application definition.
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django_bootstrap5',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'core.apps.CoreConfig',
+    'blog.apps.BlogConfig',
+    'users.apps.UsersConfig',
+    'pages.apps.PagesConfig',
+]
+
+MIDDLEWARE = [
+    'core.middleware.QueryBudgetMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Бюджеты SQL-запросов на один запрос к view: имя view -> максимум.
+QUERY_BUDGETS = {
+    'blog:index': 5,
+    'blog:search': 4,
+    'blog:category_posts': 6,
+    'blog:profile': 5,
+    'blog:post_detail': 4,
+    'blog:comments': 4,
+    'blog:create_post': 10,
+    'blog:edit_post': 11,
+    'blog:delete_post': 13,
+    'blog:add_comment': 8,
+    'blog:edit_comment': 5,
+    'blog:delete_comment': 8,
+    'blog:edit_profile': 4,
+}
+
+# Бросать исключение при превышении бюджета, а не только писать в лог.
+QUERY_BUDGETS_ENFORCE = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.queries': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blogicum.templates': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blogicum.moderation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Асинхронные версии лент и страницы поста; включаются в asgi.py.
+ASYNC_READ_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# Число потоков, в которых асинхронные view ходят в БД и рисуют шаблоны.
+ASYNC_DB_WORKERS = 8
+
+# Разобрать все шаблоны в кэш загрузчика при старте воркера WSGI/ASGI.
+TEMPLATES_WARMUP = False
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BLOGICUM_DB_PATH', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
+# Реплика для чтения лент и страниц постов. Локально это второй файл
+# SQLite из BLOGICUM_REPLICA_DB, его заполняет команда sync_replica.
+REPLICA_DATABASE = 'replica'
+
+if os.environ.get('BLOGICUM_REPLICA_DB'):
+    DATABASES[REPLICA_DATABASE] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BLOGICUM_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Максимальное отставание реплики, в секундах: столько после записи
+# клиент читает из основной БД.
+REPLICA_LAG_SECONDS = 5
+
+# Password validation.
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Internationalization.
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+# БЛОК СВЯЗАННЫЙ С РЕГИСТРАЦИЕЙ ПОЛЬЗОВАТЕЛЕЙ.
+
+# URL по умолчанию для аутентификации пользователя.
+LOGIN_URL = 'login'
+
+# Редирект по умолчанию после авторизации.
+LOGIN_REDIRECT_URL = 'blog:index'
+
+# Отдавать «О проекте», «Правила» и страницы ошибок из HTML, заранее
+# отрисованного командой prerender_pages в PRERENDER_ROOT.
+PRERENDERED_PAGES = False
+
+PRERENDER_ROOT = BASE_DIR / 'prerendered'
+
+# Параметры для статических ресурсов
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+# Параметры для медиаресурсов.
+MEDIA_ROOT = BASE_DIR / 'media'
+
+MEDIA_URL = '/media/'
+
+# Фото постов адресуются по хешу содержимого и не меняются, поэтому
+# браузер может кэшировать их бессрочно.
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Ширины уменьшенных копий изображений постов для srcset, по возрастанию.
+POST_IMAGE_WIDTHS = (320, 640, 1280)
+
+# Фоновые задачи (обработка изображений): число потоков и синхронный
+# режим выполнения прямо в запросе.
+BACKGROUND_WORKERS = 2
+BACKGROUND_TASKS_EAGER = False
+
+# Повторы обработки изображений: число попыток, пауза перед первым
+# повтором (далее удваивается) и время, после которого задача в работе
+# считается зависшей, в секундах.
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_RETRY_DELAY = 30
+IMAGE_JOB_TIMEOUT = 60 * 10
+
+# Файл фото без ссылок удаляется, только если его не загружали заново
+# столько секунд: пост с повторной загрузкой мог ещё не сохраниться.
+IMAGE_ORPHAN_GRACE = 60 * 10
+
+# Default primary key field type
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
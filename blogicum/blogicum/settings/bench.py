@@ -0,0 +1,27 @@
+"""Замеры производительности: настройки prod на локальной базе бенчмарка.
+
+Секреты не нужны, кэш локальный для процесса, письма не отправляются.
+"""
+import os
+
+os.environ.setdefault('BLOGICUM_SECRET_KEY', 'bench-insecure-secret-key')
+os.environ.setdefault('BLOGICUM_ALLOWED_HOSTS', 'testserver,127.0.0.1')
+
+from .prod import *  # noqa: E402,F401,F403
+from .prod import (  # noqa: E402
+    BASE_DIR,
+    DATABASES,
+)
+
+DATABASES['default']['NAME'] = os.environ.get(
+    'BLOGICUM_DB_PATH',
+    BASE_DIR.parent / 'tests' / 'benchmarks' / 'bench.sqlite3',
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
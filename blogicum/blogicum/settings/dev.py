@@ -0,0 +1,22 @@
+"""Локальная разработка: DEBUG, debug_toolbar и письма в файлы."""
+from .base import *  # noqa: F401,F403
+from .base import (
+    BASE_DIR,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+)
+
+DEBUG = True
+
+INSTALLED_APPS = [*INSTALLED_APPS, 'debug_toolbar']
+
+MIDDLEWARE = [*MIDDLEWARE, 'debug_toolbar.middleware.DebugToolbarMiddleware']
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+# Дериктория для сохранения писем
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -0,0 +1,65 @@
+"""Боевой сервер: без DEBUG и debug_toolbar, с переиспользованием
+соединений, кэшем шаблонов и общим для процессов кэшем.
+
+Секреты и адреса берутся из переменных окружения.
+"""
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import (
+    BASE_DIR,
+    DATABASES,
+    LOGGING,
+    TEMPLATES,
+)
+
+DEBUG = False
+
+SECRET_KEY = os.environ['BLOGICUM_SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ.get('BLOGICUM_ALLOWED_HOSTS', '').split(',')
+
+# Соединение с БД живёт между запросами, а не открывается на каждый.
+DATABASES['default']['CONN_MAX_AGE'] = 60 * 10
+
+# Шаблоны компилируются один раз на процесс, сразу при его старте.
+TEMPLATES_WARMUP = True
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    (
+        'django.template.loaders.cached.Loader',
+        [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ],
+    ),
+]
+
+# Версии кэша лент и карточек должны быть общими для всех процессов.
+if os.environ.get('BLOGICUM_MEMCACHED'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['BLOGICUM_MEMCACHED'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get(
+                'BLOGICUM_CACHE_DIR', BASE_DIR / 'cache'
+            ),
+        },
+    }
+
+# Статичные страницы отдаются без шаблонов; при выкладке нужно
+# выполнить prerender_pages, без файлов страницы рисуются как обычно.
+PRERENDERED_PAGES = True
+
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = os.environ.get('BLOGICUM_EMAIL_HOST', 'localhost')
+
+# Построчный лог каждого запроса нужен при разработке, на сервере
+# пишутся только превышения бюджетов.
+LOGGING['loggers']['blogicum.queries']['level'] = 'WARNING'
@@ -0,0 +1,61 @@
+"""Асинхронные версии синхронных view для запуска под ASGI.
+
+В Django 3.2 нет асинхронного ORM, а синхронные view под ASGI
+выполняются по очереди в одном общем потоке. Обёртка выполняет view
+целиком, вместе с отрисовкой шаблона, в отдельном пуле потоков чтения.
+Цикл событий тем временем обслуживает другие, в том числе медленные,
+соединения.
+"""
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_DB_WORKERS,
+            thread_name_prefix='blog-read',
+        )
+    return _executor
+
+
+def _run_view(view, request, args, kwargs):
+    # Соединения потоков пула живут по правилам CONN_MAX_AGE, как и
+    # соединения воркера WSGI между запросами. Запросы к БД считает
+    # count_request_queries из QueryBudgetMiddleware.
+    close_old_connections()
+    stats = getattr(request, 'query_stats', None)
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            started = time.perf_counter()
+            response.render()
+            if stats is not None:
+                stats.render_time = time.perf_counter() - started
+        return response
+    finally:
+        close_old_connections()
+
+
+def as_async_view(view_class, **initkwargs):
+    """Асинхронный view из класса: запрос к БД и отрисовка в пуле."""
+    view = view_class.as_view(**initkwargs)
+    run = sync_to_async(
+        _run_view, thread_sensitive=False, executor=_get_executor()
+    )
+
+    async def async_view(request, *args, **kwargs):
+        return await run(view, request, args, kwargs)
+
+    update_wrapper(async_view, view)
+    return async_view
@@ -0,0 +1,86 @@
+"""Чтение из реплики для страниц, которые разрешили это явно.
+
+Реплика подключается алиасом REPLICA_DATABASE в DATABASES. Без него,
+внутри транзакции и у клиента, который недавно писал, все запросы идут
+в default. Страница разрешает реплику атрибутом view-класса
+`replica_reads`.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+
+def replica_alias():
+    """Алиас реплики или None, если она не настроена."""
+    alias = settings.REPLICA_DATABASE
+    return alias if alias in connections.databases else None
+
+
+def allow_replica_reads():
+    """Разрешает чтение из реплики до конца текущего запроса."""
+    _replica_reads.set(True)
+
+
+def begin_request_routing(pinned):
+    """Сбрасывает состояние маршрутизации в начале HTTP-запроса.
+
+    `pinned` — клиент недавно писал и должен читать из default.
+    """
+    _replica_reads.set(False)
+    _pinned.set(pinned)
+
+
+def end_request_routing():
+    """Возвращает чтение в default после ответа на запрос."""
+    _replica_reads.set(False)
+    _pinned.set(False)
+
+
+def reads_from_replica():
+    """Читает ли текущий запрос из реплики.
+
+    Реплика может отставать, а версии в кэше запись уже сбросила, поэтому
+    такие запросы не кэшируют прочитанное под новыми версиями и не
+    отдают валидаторы.
+    """
+    return (
+        replica_alias() is not None
+        and _replica_reads.get()
+        and not _pinned.get()
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    )
+
+
+class ReplicaRouter:
+    """Роутер: запись всегда в default, чтение в реплику по разрешению."""
+
+    def db_for_read(self, model, **hints):
+        if replica_alias() is None:
+            return None
+        if reads_from_replica():
+            return replica_alias()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if replica_alias() is None:
+            return None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема и данные попадают в реплику репликацией, а не migrate.
+        if db == replica_alias():
+            return False
+        return None
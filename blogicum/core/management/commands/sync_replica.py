@@ -0,0 +1,31 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections,
+)
+
+from core.db_router import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файл реплики: локальная замена '
+        'репликации для проверки чтения из реплики.'
+    )
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError(
+                'Реплика не настроена: задайте BLOGICUM_REPLICA_DB.'
+            )
+        source, target = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+            raise CommandError('Копирование поддерживается только для SQLite.')
+        source.ensure_connection()
+        target.ensure_connection()
+        source.connection.backup(target.connection)
+        self.stdout.write(self.style.SUCCESS(f'Реплика {alias} обновлена.'))
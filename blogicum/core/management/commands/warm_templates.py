@@ -0,0 +1,21 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+)
+
+from core.template_warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Разбирает все шаблоны проекта и приложений; при ошибке разбора '
+        'завершается с ошибкой. Шаг проверки перед выкладкой.'
+    )
+
+    def handle(self, *args, **options):
+        warmed, errors = warm_templates()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
+        self.stdout.write(self.style.SUCCESS(f'Разобрано шаблонов: {warmed}'))
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import time
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from .db_router import (
+    allow_replica_reads,
+    begin_request_routing,
+    end_request_routing,
+    replica_alias,
+)
+
+logger = logging.getLogger('blogicum.queries')
+
+_request_stats = ContextVar('query_stats', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше SQL-запросов, чем разрешено."""
+
+
+class QueryStats:
+    """Счётчик запросов и времени БД, подключаемый как execute_wrapper."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def count_request_queries(execute, sql, params, many, context):
+    """execute_wrapper каждого соединения: считает запросы HTTP-запроса.
+
+    Счётчик запроса хранится в contextvar, а sync_to_async копирует
+    контекст в свои потоки. Поэтому запросы учитываются и в общем потоке
+    синхронных view под ASGI, и в пуле as_async_view.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """Обработчик connection_created: подключает count_request_queries."""
+    if count_request_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_request_queries)
+
+
+class QueryBudgetMiddleware:
+    """Замеряет запросы, время БД и отрисовки шаблона для каждого view.
+
+    Пишет одну строку лога на запрос в логгер blogicum.queries.
+    Если для view задан бюджет в QUERY_BUDGETS и он превышен, пишет
+    предупреждение, а при QUERY_BUDGETS_ENFORCE бросает исключение.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Как в MiddlewareMixin: под ASGI экземпляр — корутина.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        token = _request_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.finish(request, stats, start, response)
+        return response
+
+    async def __acall__(self, request):
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        token = _request_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self.finish(request, stats, start, response)
+        return response
+
+    def finish(self, request, stats, start, response):
+        total_time = time.perf_counter() - start
+        match = request.resolver_match
+        if match is not None:
+            self.report(match.view_name, stats, total_time, response)
+
+    def process_template_response(self, request, response):
+        if response.is_rendered:
+            # Асинхронный view уже отрисовал шаблон и замерил время сам.
+            return response
+        started = time.perf_counter()
+
+        def finish_render(response):
+            request.query_stats.render_time = time.perf_counter() - started
+
+        response.add_post_render_callback(finish_render)
+        return response
+
+    def report(self, view_name, stats, total_time, response):
+        logger.info(
+            'view=%s status=%d queries=%d db_ms=%.1f render_ms=%.1f '
+            'total_ms=%.1f',
+            view_name,
+            response.status_code,
+            stats.queries,
+            stats.db_time * 1000,
+            stats.render_time * 1000,
+            total_time * 1000,
+        )
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is None or stats.queries <= budget:
+            return
+        message = (
+            f'{view_name} выполнил {stats.queries} SQL-запросов '
+            f'при бюджете {budget}'
+        )
+        if settings.QUERY_BUDGETS_ENFORCE:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Направляет чтение страниц с `replica_reads = True` в реплику.
+
+    После запроса на запись (не GET и не HEAD) клиент получает cookie и
+    до конца лага реплики читает из основной БД, поэтому автор сразу
+    видит свой пост. Остальные клиенты продолжают читать из реплики.
+    """
+
+    cookie_name = 'use_primary'
+    safe_methods = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def process_request(self, request):
+        request.replica_routing = replica_alias() is not None
+        if request.replica_routing:
+            begin_request_routing(self.cookie_name in request.COOKIES)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if request.replica_routing and getattr(
+            view_class, 'replica_reads', False
+        ):
+            allow_replica_reads()
+
+    def process_response(self, request, response):
+        if not getattr(request, 'replica_routing', False):
+            return response
+        if request.method not in self.safe_methods:
+            response.set_cookie(
+                self.cookie_name,
+                '1',
+                max_age=settings.REPLICA_LAG_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        end_request_routing()
+        return response
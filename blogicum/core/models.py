@@ -1,8 +1,23 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class MetaQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """Массовое обновление тоже меняет updated_at и version строк."""
+        kwargs.setdefault('updated_at', timezone.now())
+        kwargs.setdefault('version', F('version') + 1)
+        return super().update(**kwargs)
 
 
 class MetaModel(models.Model):
-    """Абстрактная модель. Добавляет флаг is_published, created_at."""
+    """Абстрактная модель. Добавляет флаг is_published, created_at.
+
+    updated_at и version меняются при каждом сохранении, в том числе
+    через QuerySet.update(), и служат для построения ключей кэша.
+    """
 
     is_published = models.BooleanField(
         'Опубликовано',
@@ -10,6 +25,59 @@ class MetaModel(models.Model):
         help_text='Снимите галочку, чтобы скрыть публикацию.'
     )
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    # Не auto_now: у такого поля нет значения по умолчанию, и фикстуры
+    # без updated_at (db.json) перестают загружаться.
+    updated_at = models.DateTimeField(
+        'Изменено', default=timezone.now, editable=False
+    )
+    version = models.PositiveBigIntegerField(
+        'Версия', default=1, editable=False
+    )
+
+    objects = MetaQuerySet.as_manager()
 
     class Meta:
         abstract = True
+
+    def save(self, *args, **kwargs):
+        self.updated_at = timezone.now()
+        # Версию увеличивает сама БД: у загруженного раньше экземпляра
+        # она могла отстать от строки, и версия пошла бы назад.
+        bump = (
+            not self._state.adding
+            and self.pk is not None
+            and not kwargs.get('force_insert')
+        )
+        if bump:
+            self.version = F('version') + 1
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'updated_at', 'version'
+            }
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(using=self._state.db, fields=['version'])
+
+    @property
+    def cache_version(self):
+        """Версия строки для ключа кэша.
+
+        Время правки отличает версии при одновременных сохранениях.
+        """
+        return f'{self.pk}.{self.version}.{self.updated_at.timestamp()}'
+
+
+def cache_key(prefix, *objects):
+    """Ключ кэша из версий объектов, None на месте объекта допустим.
+
+    Ключ меняется при любой правке любого из объектов, поэтому старые
+    записи сбрасывать не нужно: они вытесняются по таймауту.
+    """
+    return ':'.join([
+        prefix,
+        *(
+            'none' if obj is None else obj.cache_version
+            for obj in objects
+        ),
+    ])
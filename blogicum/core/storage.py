@@ -0,0 +1,88 @@
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+
+from pathlib import PurePosixPath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище, адресующее файлы по SHA-256 содержимого.
+
+    Хеш считается по мере записи загрузки во временный файл, затем файл
+    переносится в <папка>/<ab>/<sha256>.<ext>. Повторная загрузка того же
+    содержимого ничего не пишет и возвращает уже существующее имя, поэтому
+    файл по такому имени никогда не меняется. Она лишь обновляет время
+    изменения файла, и delete_unused не удалит его, пока пост с новой
+    загрузкой не сохранён.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Имя определяется содержимым, суффиксы для уникальности не нужны.
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.join(self.location, '.incoming')
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            hexdigest = digest.hexdigest()
+            path = PurePosixPath(name)
+            target = str(
+                path.parent / hexdigest[:2]
+                / f'{hexdigest}{path.suffix.lower()}'
+            )
+            full_path = self.path(target)
+            try:
+                os.utime(full_path)
+                return target
+            except FileNotFoundError:
+                # Файла нет или его как раз проверяет delete_unused.
+                pass
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            os.replace(tmp_path, full_path)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+            return target
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def delete_unused(self, name, in_use, grace):
+        """Удаляет файл, если он старше `grace` секунд и не нужен.
+
+        Файл сначала переносится в сторону, и только потом проверяются
+        время изменения и `in_use(name)`. Загрузка того же содержимого в
+        это время не найдёт файл и запишет его заново, а загрузка до
+        переноса обновит время, и файл вернётся на место. Возвращает
+        True, если файл удалён.
+        """
+        full_path = self.path(name)
+        directory = os.path.join(self.location, '.trash')
+        os.makedirs(directory, exist_ok=True)
+        trash_path = os.path.join(directory, uuid.uuid4().hex)
+        try:
+            os.replace(full_path, trash_path)
+        except FileNotFoundError:
+            return False
+        fresh = time.time() - os.stat(trash_path).st_mtime < grace
+        if fresh or in_use(name):
+            os.replace(trash_path, full_path)
+            return False
+        os.remove(trash_path)
+        return True
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,64 @@
+"""Прогрев кэша шаблонов при старте процесса.
+
+Кэширующий загрузчик компилирует шаблон при первом обращении, поэтому
+первые запросы каждого воркера платят за разбор всех шаблонов страницы
+и их include. Прогрев разбирает все шаблоны проекта и приложений заранее.
+"""
+import logging
+import time
+
+from pathlib import Path
+
+from django.template import (
+    TemplateDoesNotExist,
+    TemplateSyntaxError,
+    engines,
+)
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger('blogicum.templates')
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS и каталогов templates приложений."""
+    dirs = list(engine.engine.dirs)
+    if engine.engine.app_dirs or any(
+        'app_directories' in str(loader)
+        for loader in engine.engine.loaders
+    ):
+        dirs.extend(get_app_template_dirs('templates'))
+    names = set()
+    for directory in map(Path, dirs):
+        names.update(
+            path.relative_to(directory).as_posix()
+            for path in directory.rglob('*')
+            if path.is_file()
+        )
+    return sorted(names)
+
+
+def warm_templates():
+    """Компилирует все шаблоны в кэш загрузчика.
+
+    Возвращает число шаблонов и словарь ошибок разбора по именам.
+    """
+    start = time.perf_counter()
+    warmed, errors = 0, {}
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as e:
+                errors[name] = e
+            else:
+                warmed += 1
+    logger.info(
+        'templates warmed=%d errors=%d ms=%.1f',
+        warmed,
+        len(errors),
+        (time.perf_counter() - start) * 1000,
+    )
+    return warmed, errors
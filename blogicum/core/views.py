@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.views.static import serve
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """Отдаёт медиафайлы с вечным кэшем в браузере.
+
+    Имена файлов постов — хеши содержимого, поэтому файл по имени никогда
+    не меняется и его можно кэшировать как immutable.
+    """
+    response = serve(request, path, document_root, show_indexes)
+    response['Cache-Control'] = (
+        f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable'
+    )
+    return response
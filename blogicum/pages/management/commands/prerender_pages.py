@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from pages.prerender import prerender_pages
+
+
+class Command(BaseCommand):
+    help = (
+        'Отрисовывает «О проекте», «Правила» и страницы ошибок в HTML '
+        'в PRERENDER_ROOT. Запускается при каждой выкладке.'
+    )
+
+    def handle(self, *args, **options):
+        names = prerender_pages()
+        self.stdout.write(
+            self.style.SUCCESS(f'Отрисовано: {", ".join(names)}')
+        )
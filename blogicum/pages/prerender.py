@@ -0,0 +1,130 @@
+"""Предварительная отрисовка статичных страниц в HTML при выкладке.
+
+Страницы «О проекте», «Правила» и страницы ошибок одинаковы для всех,
+кроме кнопок пользователя в хэдере и адреса на странице 404. На их
+месте в файлах стоят метки @@имя@@, при ответе они заменяются строками
+без шаблонизатора и запросов к страницам.
+"""
+import re
+
+from functools import lru_cache
+from http import HTTPStatus
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+)
+from django.template.loader import render_to_string
+from django.urls import (
+    resolve,
+    reverse,
+)
+from django.utils.html import escape
+
+SLOT_RE = re.compile(r'@@(\w+)@@')
+
+# Имя файла -> шаблон и адрес, с которым он отрисовывается.
+PAGES = {
+    'about': ('pages/about.html', 'pages:about'),
+    'rules': ('pages/rules.html', 'pages:rules'),
+    '404': ('pages/404.html', None),
+    '500': ('pages/500.html', None),
+    '403csrf': ('pages/403csrf.html', None),
+}
+USER_NAV_TEMPLATE = 'includes/user_nav.html'
+
+
+def slot(name):
+    return f'@@{name}@@'
+
+
+def fill_slots(text, values):
+    """Подставляет значения меток за один проход по тексту."""
+    return SLOT_RE.sub(lambda match: values[match.group(1)], text)
+
+
+def _request(url_name):
+    path = reverse(url_name) if url_name else '/'
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.user = AnonymousUser()
+    request.resolver_match = resolve(path) if url_name else None
+    request.build_absolute_uri = lambda location=None: slot('absolute_uri')
+    return request
+
+
+def render_pages():
+    """Отрисовывает страницы и фрагменты; возвращает имя -> HTML."""
+    rendered = {
+        name: render_to_string(
+            template,
+            {'user_nav_slot': slot('user_nav')},
+            request=_request(url_name),
+        )
+        for name, (template, url_name) in PAGES.items()
+    }
+    rendered['user_nav_anonymous'] = render_to_string(
+        USER_NAV_TEMPLATE, {'user': AnonymousUser()}
+    )
+    rendered['user_nav_authenticated'] = render_to_string(
+        USER_NAV_TEMPLATE,
+        {'user': SimpleNamespace(
+            is_authenticated=True, username=slot('username')
+        )},
+    )
+    return rendered
+
+
+def prerender_pages(root=None):
+    """Записывает страницы в PRERENDER_ROOT и сбрасывает кэш чтения."""
+    root = Path(root or settings.PRERENDER_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    rendered = render_pages()
+    for name, html in rendered.items():
+        (root / f'{name}.html').write_text(html, encoding='utf-8')
+    _read_page.cache_clear()
+    return sorted(rendered)
+
+
+@lru_cache(maxsize=64)
+def _read_page(path, mtime):
+    return path.read_text(encoding='utf-8')
+
+
+def load_page(root, name):
+    """Содержимое файла страницы или None, если файла нет.
+
+    Файл читается заново только после изменения, поэтому страница,
+    отрисованная после первого промаха или другим процессом, подхватывается
+    без перезапуска.
+    """
+    path = Path(root) / f'{name}.html'
+    try:
+        return _read_page(path, path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def prerendered_response(request, name, status=HTTPStatus.OK):
+    """Ответ из готового HTML или None, если режим выключен или файла нет."""
+    if not settings.PRERENDERED_PAGES:
+        return None
+    root = str(settings.PRERENDER_ROOT)
+    page = load_page(root, name)
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        nav = load_page(root, 'user_nav_authenticated')
+        nav = nav and fill_slots(nav, {'username': escape(user.username)})
+    else:
+        nav = load_page(root, 'user_nav_anonymous')
+    if page is None or nav is None:
+        return None
+    values = {'user_nav': nav}
+    if slot('absolute_uri') in page:
+        values['absolute_uri'] = escape(request.build_absolute_uri())
+    return HttpResponse(fill_slots(page, values), status=status)
@@ -3,30 +3,49 @@ from http import HTTPStatus
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from .prerender import prerendered_response
 
-class About(TemplateView):
+
+class PrerenderedMixin:
+    """Миксин: страница отдаётся из заранее отрисованного HTML."""
+
+    prerendered_name = None
+
+    def get(self, request, *args, **kwargs):
+        response = prerendered_response(request, self.prerendered_name)
+        if response is not None:
+            return response
+        return super().get(request, *args, **kwargs)
+
+
+class About(PrerenderedMixin, TemplateView):
 
     template_name = 'pages/about.html'
+    prerendered_name = 'about'
 
 
-class Rules(TemplateView):
+class Rules(PrerenderedMixin, TemplateView):
 
     template_name = 'pages/rules.html'
+    prerendered_name = 'rules'
 
 
 def custom_500(request):
-    return render(
-        request, 'pages/500.html', status=HTTPStatus.INTERNAL_SERVER_ERROR
+    status = HTTPStatus.INTERNAL_SERVER_ERROR
+    return prerendered_response(request, '500', status) or render(
+        request, 'pages/500.html', status=status
     )
 
 
 def page_not_found(request, exception):
-    return render(
-        request, 'pages/404.html', status=HTTPStatus.NOT_FOUND
+    status = HTTPStatus.NOT_FOUND
+    return prerendered_response(request, '404', status) or render(
+        request, 'pages/404.html', status=status
     )
 
 
 def csrf_failure(request, reason=''):
-    return render(
-        request, 'pages/403csrf.html', status=HTTPStatus.FORBIDDEN
+    status = HTTPStatus.FORBIDDEN
+    return prerendered_response(request, '403csrf', status) or render(
+        request, 'pages/403csrf.html', status=status
     )
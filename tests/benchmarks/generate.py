@@ -0,0 +1,134 @@
+"""Генератор большого синтетического набора данных для бенчмарков.
+
+Справочники (пользователи, категории, места) создаются через mixer, как
+и в фикстурах тестов. Посты и комментарии вставляются bulk_create
+порциями по `chunk_size`, чтобы память не росла с объёмом данных.
+Тексты берутся из заранее сгенерированного пула фраз faker.
+"""
+import random
+from datetime import timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+TEXT_POOL_SIZE = 1000
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _blend_unsaved(mixer: Mixer, model: str, count: int, **fields):
+    for i in range(count):
+        yield mixer.blend(
+            model,
+            **{
+                name: value(i) if callable(value) else value
+                for name, value in fields.items()
+            },
+        )
+
+
+def _bulk_create(model, objects, chunk_size, report):
+    created = 0
+    for chunk in _chunks(objects, chunk_size):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk, batch_size=chunk_size)
+        created += len(chunk)
+        report(f"{model.__name__}: {created}")
+
+
+def generate(
+    users: int = 2000,
+    categories: int = 2000,
+    locations: int = 500,
+    posts: int = 1_000_000,
+    comments: int = 10_000_000,
+    chunk_size: int = 10_000,
+    seed: int = 0,
+    report=print,
+):
+    from blog.models import Category, Comment, Location, Post
+
+    rnd = random.Random(seed)
+    mixer = Mixer(commit=False)
+    mixer.faker.seed_instance(seed)
+    User = get_user_model()
+
+    _bulk_create(
+        User,
+        _blend_unsaved(
+            mixer, "auth.User", users,
+            username=lambda i: f"bench_user_{i}",
+        ),
+        chunk_size,
+        report,
+    )
+    _bulk_create(
+        Category,
+        _blend_unsaved(
+            mixer, "blog.Category", categories,
+            slug=lambda i: f"bench-{i}",
+            is_published=lambda i: rnd.random() > 0.05,
+        ),
+        chunk_size,
+        report,
+    )
+    _bulk_create(
+        Location,
+        _blend_unsaved(mixer, "blog.Location", locations),
+        chunk_size,
+        report,
+    )
+
+    user_ids = list(User.objects.values_list("id", flat=True))
+    category_ids = list(Category.objects.values_list("id", flat=True))
+    location_ids = list(Location.objects.values_list("id", flat=True))
+    titles = [mixer.faker.sentence()[:200] for _ in range(TEXT_POOL_SIZE)]
+    texts = [mixer.faker.text(600) for _ in range(TEXT_POOL_SIZE)]
+    now = timezone.now()
+
+    def make_posts():
+        for _ in range(posts):
+            yield Post(
+                title=rnd.choice(titles),
+                text=rnd.choice(texts),
+                # Небольшая доля постов отложена в будущее.
+                pub_date=now - timedelta(minutes=rnd.randint(-1440, 5256000)),
+                is_published=rnd.random() > 0.02,
+                author_id=rnd.choice(user_ids),
+                category_id=rnd.choice(category_ids),
+                location_id=rnd.choice(location_ids),
+            )
+
+    _bulk_create(Post, make_posts(), chunk_size, report)
+
+    first_post, last_post = (
+        Post.objects.order_by("id").values_list("id", flat=True).first(),
+        Post.objects.order_by("-id").values_list("id", flat=True).first(),
+    )
+
+    def make_comments():
+        for _ in range(comments):
+            yield Comment(
+                text=rnd.choice(titles),
+                author_id=rnd.choice(user_ids),
+                # Длинный хвост: часть постов получает тысячи комментариев.
+                post_id=min(
+                    last_post,
+                    first_post + int(rnd.paretovariate(1.2)) - 1
+                    if rnd.random() < 0.3
+                    else rnd.randint(first_post, last_post),
+                ),
+            )
+
+    if comments and first_post is not None:
+        _bulk_create(Comment, make_comments(), chunk_size, report)
+    report("Пересчёт счётчиков комментариев")
+    Post.objects.sync_comment_count()
@@ -0,0 +1,202 @@
+"""Пропускная способность и хвост задержек под медленными клиентами: ASGI и WSGI.
+
+Примеры:
+    python tests/benchmarks/load.py
+    python tests/benchmarks/load.py --servers uvicorn --slow 200 --fast 20
+
+Сервер запускается отдельным процессом в профиле bench на базе
+бенчмарка (tests/benchmarks/bench.sqlite3, её заполняет
+`run.py generate`):
+
+- `uvicorn` — blogicum.asgi, читающие view асинхронные;
+- `gunicorn` — blogicum.wsgi с синхронными воркерами-потоками.
+
+Медленные клиенты держат соединения, отправляя заголовки по байту раз
+в `--trickle` секунд; быстрые клиенты в это время запрашивают страницы
+по кругу. Для быстрых клиентов выводятся число ответов в секунду и
+p50/p99 задержки. Серверы ставятся из tests/benchmarks/requirements.txt.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent.parent
+DEFAULT_DB = BENCH_DIR / "bench.sqlite3"
+HOST = "127.0.0.1"
+
+SERVERS = {
+    "uvicorn": [
+        "uvicorn", "blogicum.asgi:application",
+        "--host", HOST, "--port", "{port}", "--workers", "{workers}",
+        "--no-access-log",
+    ],
+    "gunicorn": [
+        "gunicorn", "blogicum.wsgi:application",
+        "--bind", f"{HOST}:{{port}}", "--workers", "{workers}",
+        "--threads", "{threads}",
+    ],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, port, args):
+    command = [
+        part.format(port=port, workers=args.workers, threads=args.threads)
+        for part in SERVERS[name]
+    ]
+    if shutil.which(command[0]) is None:
+        raise RuntimeError(
+            f"{command[0]} не найден: pip install -r "
+            "tests/benchmarks/requirements.txt"
+        )
+    env = {
+        **os.environ,
+        "BLOGICUM_ENV": "bench",
+        "BLOGICUM_DB_PATH": str(args.db),
+        "BLOGICUM_ALLOWED_HOSTS": HOST,
+    }
+    # Вывод сервера не читается во время прогона, поэтому пишется в файл,
+    # а не в канал, который может переполниться.
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        command, cwd=ROOT_DIR / "blogicum", env=env,
+        stdout=subprocess.DEVNULL, stderr=log,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            log.close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    process.wait()
+    log.seek(0)
+    output = log.read().decode(errors="replace").strip()
+    log.close()
+    raise RuntimeError(f"{name} не запустился на порту {port}:\n{output}")
+
+
+def request_bytes(url):
+    return (
+        f"GET {url} HTTP/1.1\r\nHost: {HOST}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode()
+
+
+async def slow_client(port, url, trickle, stop):
+    """Держит соединение, отправляя запрос по одному байту."""
+    while not stop.is_set():
+        try:
+            reader, writer = await asyncio.open_connection(HOST, port)
+            for byte in request_bytes(url):
+                if stop.is_set():
+                    break
+                writer.write(bytes([byte]))
+                await writer.drain()
+                await asyncio.sleep(trickle)
+            await reader.read()
+            writer.close()
+        except OSError:
+            await asyncio.sleep(trickle)
+
+
+async def fast_client(port, url, stop, timings, errors):
+    data = request_bytes(url)
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection(HOST, port)
+            writer.write(data)
+            await writer.drain()
+            status = await reader.readline()
+            await reader.read()
+            writer.close()
+        except OSError:
+            errors.append("connection")
+            continue
+        if b" 200 " not in status:
+            errors.append(status.decode(errors="replace").strip())
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+
+
+async def load(port, args):
+    stop = asyncio.Event()
+    timings, errors = [], []
+    slow = [
+        asyncio.create_task(slow_client(port, args.url, args.trickle, stop))
+        for _ in range(args.slow)
+    ]
+    await asyncio.sleep(args.trickle * 2)
+    fast = [
+        asyncio.create_task(fast_client(port, args.url, stop, timings, errors))
+        for _ in range(args.fast)
+    ]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.wait(fast, timeout=10)
+    for task in [*slow, *fast]:
+        task.cancel()
+    if not timings:
+        return {"rps": 0, "errors": len(errors)}
+    timings.sort()
+    return {
+        "rps": round(len(timings) / args.duration, 1),
+        "p50_ms": round(statistics.median(timings), 2),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 2),
+        "errors": len(errors),
+    }
+
+
+def measure(name, args):
+    port = free_port()
+    process = start_server(name, port, args)
+    try:
+        return asyncio.run(load(port, args))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument(
+        "--servers", nargs="+", choices=SERVERS, default=list(SERVERS)
+    )
+    parser.add_argument("--url", default="/")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--slow", type=int, default=100)
+    parser.add_argument("--fast", type=int, default=10)
+    parser.add_argument("--trickle", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    if not args.db.exists():
+        print(f"Нет базы {args.db}: запустите run.py generate", file=sys.stderr)
+        return 1
+
+    result = {name: measure(name, args) for name in args.servers}
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Бенчмарк публичных страниц блога на большом синтетическом наборе.
+
+Примеры:
+    python tests/benchmarks/run.py generate --posts 1000000 \\
+        --comments 10000000
+    python tests/benchmarks/run.py run --save-baseline
+    python tests/benchmarks/run.py run --compare
+
+Данные лежат в отдельной базе (по умолчанию tests/benchmarks/bench.sqlite3),
+рабочая db.sqlite3 не затрагивается. Для каждой страницы считаются
+p50/p99 задержки, число SQL-запросов и пик выделенной памяти; результат
+пишется в JSON и сравнивается с сохранённым базовым прогоном.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent.parent
+DEFAULT_DB = BENCH_DIR / "bench.sqlite3"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+
+def setup_django(db_path):
+    sys.path[:0] = [str(ROOT_DIR / "blogicum"), str(BENCH_DIR.parent)]
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "blogicum.settings")
+    os.environ.setdefault("BLOGICUM_ENV", "bench")
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = str(db_path)
+    import django
+
+    django.setup()
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment(debug=False)
+    logging.getLogger("blogicum.queries").setLevel(logging.WARNING)
+
+
+def pick_targets(rnd, samples):
+    """Случайные, но воспроизводимые адреса для каждой страницы."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Max
+    from django.utils import timezone
+
+    from blog.models import Category, Post
+
+    slugs = list(
+        Category.objects.filter(is_published=True)
+        .values_list("slug", flat=True)[:1000]
+    )
+    usernames = list(
+        get_user_model().objects.values_list("username", flat=True)[:1000]
+    )
+    max_id = Post.objects.aggregate(top=Max("id"))["top"] or 0
+    visible = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=timezone.now(),
+    )
+    post_ids = []
+    while max_id and len(post_ids) < samples:
+        post = visible.filter(id__gte=rnd.randint(1, max_id)).order_by("id")
+        post_id = post.values_list("id", flat=True).first()
+        if post_id:
+            post_ids.append(post_id)
+    return {
+        "index": lambda: "/",
+        "index_deep": lambda: f"/?page={rnd.randint(50, 500)}",
+        "category": lambda: f"/category/{rnd.choice(slugs)}/",
+        "profile": lambda: f"/profile/{rnd.choice(usernames)}/",
+        "post_detail": lambda: f"/posts/{rnd.choice(post_ids)}/",
+    }
+
+
+def measure(client, make_url, samples, memory_samples=10):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings, queries, peaks = [], [], []
+    for _ in range(samples):
+        url = make_url()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        if response.status_code not in (200, 404):
+            raise RuntimeError(f"{url} вернул {response.status_code}")
+    # tracemalloc заметно замедляет код, поэтому память меряется отдельно.
+    for _ in range(min(samples, memory_samples)):
+        url = make_url()
+        tracemalloc.start()
+        client.get(url)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+    cuts = statistics.quantiles(timings, n=100)
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p99_ms": round(cuts[98], 2),
+        "queries": max(queries),
+        "peak_kb": round(max(peaks), 1),
+    }
+
+
+def dataset_size():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Comment, Post
+
+    return {
+        "users": get_user_model().objects.count(),
+        "categories": Category.objects.count(),
+        "posts": Post.objects.count(),
+        "comments": Comment.objects.count(),
+    }
+
+
+def run(args):
+    from django.test import Client
+
+    rnd = random.Random(args.seed)
+    client = Client()
+    # Прогрев: первые запросы включают импорт и компиляцию шаблонов.
+    client.get("/")
+    endpoints = {
+        name: measure(client, make_url, args.samples)
+        for name, make_url in pick_targets(rnd, args.samples).items()
+    }
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "samples": args.samples,
+            "dataset": dataset_size(),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Возвращает список регрессий относительно базового прогона."""
+    regressions = []
+    for name, current in result["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        if current["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: запросов {before['queries']} -> {current['queries']}"
+            )
+        for metric in ("p50_ms", "p99_ms", "peak_kb"):
+            if current[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {before[metric]} -> {current[metric]}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--seed", type=int, default=0)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="Заполнить базу бенчмарка.")
+    gen.add_argument("--users", type=int, default=2000)
+    gen.add_argument("--categories", type=int, default=2000)
+    gen.add_argument("--locations", type=int, default=500)
+    gen.add_argument("--posts", type=int, default=1_000_000)
+    gen.add_argument("--comments", type=int, default=10_000_000)
+    gen.add_argument("--chunk-size", type=int, default=10_000)
+
+    bench = commands.add_parser("run", help="Замерить страницы.")
+    bench.add_argument("--samples", type=int, default=200)
+    bench.add_argument("--output", type=Path)
+    bench.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    bench.add_argument("--save-baseline", action="store_true")
+    bench.add_argument("--compare", action="store_true")
+    bench.add_argument("--tolerance", type=float, default=0.2)
+
+    args = parser.parse_args()
+    setup_django(args.db)
+    from django.core.management import call_command
+
+    if args.command == "generate":
+        from generate import generate
+
+        call_command("migrate", verbosity=0)
+        generate(
+            users=args.users,
+            categories=args.categories,
+            locations=args.locations,
+            posts=args.posts,
+            comments=args.comments,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+        )
+        return 0
+
+    result = run(args)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(result, indent=2))
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(result, baseline, args.tolerance)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
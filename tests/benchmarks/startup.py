@@ -0,0 +1,117 @@
+"""Замер холодного старта и накладных расходов запроса по профилям настроек.
+
+Примеры:
+    python tests/benchmarks/startup.py
+    python tests/benchmarks/startup.py --profiles dev prod --repeat 10
+
+Каждый замер идёт в отдельном процессе: загрузка приложения WSGI (с
+прогревом шаблонов, если он включён в профиле), первый запрос
+(соединение с БД, компиляция непрогретых шаблонов) и медиана
+последующих запросов к одной странице. Страницы читаются из базы
+бенчмарка (tests/benchmarks/bench.sqlite3), её заполняет
+`run.py generate`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent.parent
+DEFAULT_DB = BENCH_DIR / "bench.sqlite3"
+
+
+def child(url, requests):
+    """Тело дочернего процесса: печатает замеры одной строкой JSON."""
+    start = time.perf_counter()
+    sys.path.insert(0, str(ROOT_DIR / "blogicum"))
+    # Как воркер WSGI: настройка приложений и прогрев шаблонов профиля.
+    import blogicum.wsgi  # noqa: F401
+    from django.test import Client
+
+    setup_ms = (time.perf_counter() - start) * 1000
+    client = Client(HTTP_HOST="127.0.0.1")
+    started = time.perf_counter()
+    response = client.get(url)
+    first_ms = (time.perf_counter() - started) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} вернул {response.status_code}")
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(json.dumps({
+        "setup_ms": setup_ms,
+        "first_request_ms": first_ms,
+        "request_ms": statistics.median(timings),
+    }))
+
+
+def measure(profile, args, cache_dir):
+    env = {
+        **os.environ,
+        "BLOGICUM_ENV": profile,
+        "BLOGICUM_DB_PATH": str(args.db),
+        "BLOGICUM_CACHE_DIR": cache_dir,
+        "BLOGICUM_SECRET_KEY": "startup-bench-secret-key",
+        "BLOGICUM_ALLOWED_HOSTS": "127.0.0.1",
+    }
+    command = [
+        sys.executable, __file__, "--child",
+        "--url", args.url, "--requests", str(args.requests),
+    ]
+    runs = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            command, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        process_ms = (time.perf_counter() - start) * 1000
+        runs.append({**json.loads(output), "process_ms": process_ms})
+    return {
+        metric: round(statistics.median(run[metric] for run in runs), 2)
+        for metric in runs[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--profiles", nargs="+", default=["dev", "prod"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--url", default="/")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.url, args.requests)
+        return 0
+    if not args.db.exists():
+        print(f"Нет базы {args.db}: запустите run.py generate", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        result = {
+            profile: measure(profile, args, cache_dir)
+            for profile in args.profiles
+        }
+    base, *others = args.profiles
+    result["saved"] = {
+        profile: {
+            metric: round(result[base][metric] - result[profile][metric], 2)
+            for metric in result[base]
+        }
+        for profile in others
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,6 +41,12 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    with override_settings(QUERY_BUDGETS_ENFORCE=True):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.paginators import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _changelist_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries)
+
+
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comment/"])
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client, mixer, published_category, url
+):
+    def add_rows(count):
+        posts = mixer.cycle(count).blend(
+            "blog.Post", category=published_category, location=None
+        )
+        for post in posts:
+            mixer.blend("blog.Comment", post=post)
+
+    add_rows(2)
+    few = _changelist_queries(admin_client, url)
+    add_rows(20)
+    assert _changelist_queries(admin_client, url) == few, (
+        "Убедитесь, что число запросов списка в админке не зависит "
+        "от числа строк на странице."
+    )
+
+
+def test_comment_change_form_shows_readable_title(admin_client, comment):
+    url = f"/admin/blog/comment/{comment.id}/change/"
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    saved = Comment.objects.select_related("post").get(pk=comment.id)
+    assert f"Комменатрий к посту {saved.post.title}" in (
+        response.content.decode()
+    ), "Убедитесь, что заголовок комментария в админке остался читаемым."
+    assert any(
+        query["sql"].startswith('SELECT "blog_comment"')
+        and 'JOIN "blog_post"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что форма комментария читает пост вместе с ним."
+
+
+def test_unfiltered_admin_count_is_estimated(
+        settings, many_posts_with_published_locations
+):
+    settings.ADMIN_EXACT_COUNT_LIMIT = 0
+    Post.objects.filter(
+        pk=Post.objects.order_by("pk").first().pk
+    ).delete()
+    total = Post.objects.count()
+
+    estimated = EstimatedCountPaginator(Post.objects.all(), 10)
+    with CaptureQueriesContext(connection) as queries:
+        assert estimated.count == Post.objects.order_by("-pk").first().pk
+    assert "COUNT(" not in queries[0]["sql"]
+    assert estimated.count >= total
+
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(pk__gt=0), 10
+    )
+    assert filtered.count == total, (
+        "Убедитесь, что для отфильтрованного списка считается точно."
+    )
+
+
+@pytest.mark.parametrize("url,table", [
+    ("/admin/blog/post/", "blog_post"),
+    ("/admin/blog/comment/", "blog_comment"),
+])
+def test_changelist_page_does_not_sort_whole_table(
+        admin_client, comment, url, table
+):
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get(url)
+    page_query = next(
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+        and "ORDER BY" in query["sql"]
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {page_query}")
+        plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+    assert "TEMP B-TREE" not in plan, (
+        "Убедитесь, что список в админке сортируется по индексу, "
+        "а не всей таблицей на каждой странице."
+    )
@@ -0,0 +1,95 @@
+import asyncio
+import importlib
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import clear_url_caches, resolve
+
+from blog.views import IndexListView
+from core.middleware import QueryBudgetExceeded
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def _reload_urls():
+    importlib.reload(importlib.import_module("blog.urls"))
+    importlib.reload(importlib.import_module("blogicum.urls"))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_middleware(settings):
+    # debug_toolbar синхронный: с ним вся цепочка middleware синхронная.
+    settings.MIDDLEWARE = [
+        name for name in settings.MIDDLEWARE if "debug_toolbar" not in name
+    ]
+
+
+@pytest.fixture
+def async_read_views(settings, async_middleware):
+    settings.ASYNC_READ_VIEWS = True
+    _reload_urls()
+    yield
+    settings.ASYNC_READ_VIEWS = False
+    _reload_urls()
+
+
+def test_read_views_are_async_under_asgi(
+        async_read_views, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ):
+        assert asyncio.iscoroutinefunction(resolve(url).func)
+        response = async_to_sync(AsyncClient().get)(url)
+        assert response.status_code == HTTPStatus.OK
+        assert post.title in response.content.decode()
+        assert response.asgi_request.query_stats.queries > 0, (
+            "Убедитесь, что запросы асинхронных view учитываются в бюджете."
+        )
+
+
+def test_async_views_do_not_block_each_other(
+        async_read_views, monkeypatch, post_with_published_location
+):
+    barrier = threading.Barrier(2, timeout=5)
+    threads = []
+    get_queryset = IndexListView.get_queryset
+
+    def wait_for_each_other(self):
+        threads.append(threading.current_thread().name)
+        barrier.wait()
+        return get_queryset(self)
+
+    monkeypatch.setattr(IndexListView, "get_queryset", wait_for_each_other)
+
+    async def two_requests():
+        client = AsyncClient()
+        return await asyncio.gather(client.get("/"), client.get("/"))
+
+    responses = async_to_sync(two_requests)()
+    assert [r.status_code for r in responses] == [HTTPStatus.OK] * 2, (
+        "Убедитесь, что асинхронные view выполняются в пуле потоков "
+        "параллельно, а не по очереди в одном потоке."
+    )
+    assert all(name.startswith("blog-read") for name in threads)
+
+
+def test_sync_views_keep_query_budget_under_asgi(
+        async_middleware, post_with_published_location
+):
+    assert not asyncio.iscoroutinefunction(resolve("/").func)
+    response = async_to_sync(AsyncClient().get)("/")
+    assert response.asgi_request.query_stats.queries > 0, (
+        "Убедитесь, что под ASGI учитываются запросы и синхронных view."
+    )
+    with override_settings(QUERY_BUDGETS={"blog:index": 0}):
+        with pytest.raises(QueryBudgetExceeded):
+            async_to_sync(AsyncClient().get)("/")
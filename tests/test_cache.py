@@ -0,0 +1,110 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.caching import feed_cache_key
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_fragment_is_cached_and_invalidated(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode()
+
+    # update() с прежней версией строки обходит и сигналы, и версии:
+    # карточка должна остаться из кэша и переиспользоваться в профиле.
+    Post.objects.filter(pk=post.pk).update(
+        title="Новый заголовок",
+        version=F("version"),
+        updated_at=F("updated_at"),
+    )
+    assert post.title in user_client.get("/").content.decode()
+    profile = user_client.get(f"/profile/{user.username}/").content.decode()
+    assert post.title in profile
+
+    post.category.save()
+    assert "Новый заголовок" in user_client.get("/").content.decode(), (
+        "Убедитесь, что изменение категории сбрасывает кэш карточки поста."
+    )
+
+
+def _feed_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return [
+        query["sql"] for query in queries.captured_queries
+        if '"blog_post"' in query["sql"]
+    ]
+
+
+def test_public_feed_is_served_from_cache(
+        user_client, many_posts_with_published_locations, published_category
+):
+    for url in ("/", f"/category/{published_category.slug}/"):
+        _feed_queries(user_client, url)
+        warm = _feed_queries(user_client, url)
+        assert (
+            len(warm) == 1
+            and '"blog_post"."id" IN' in warm[0]
+            and "LIMIT" not in warm[0]
+        ), (
+            "Убедитесь, что повторный просмотр ленты не пересчитывает "
+            "её по дате публикации, а берёт состав страницы из кэша."
+        )
+
+
+def test_scheduled_post_appears_when_pub_date_passes(
+        mixer, user, user_client, published_category
+):
+    now = timezone.now()
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=now + timedelta(hours=1),
+    )
+    assert post.title not in user_client.get("/").content.decode()
+    with mock.patch(
+            "django.utils.timezone.now",
+            return_value=now + timedelta(hours=2),
+    ):
+        assert post.title in user_client.get("/").content.decode(), (
+            "Убедитесь, что кэш ленты сбрасывается, когда наступает дата "
+            "отложенной публикации."
+        )
+
+
+def test_feed_cache_is_reset_on_category_edit(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode()
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in user_client.get("/").content.decode()
+
+
+def test_versions_are_bumped_again_after_commit(
+        django_capture_on_commit_callbacks, post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.id)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Правка"
+        post.save()
+        # Параллельный запрос читает ещё старые данные и кэширует их
+        # под версией ленты, сброшенной до коммита.
+        before_commit = feed_cache_key("index", True)
+    assert feed_cache_key("index", True) != before_commit, (
+        "Убедитесь, что версии кэша меняются и после коммита транзакции."
+    )
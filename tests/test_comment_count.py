@@ -0,0 +1,60 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import (
+    Comment,
+    Post,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comment_count_follows_views(user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment", data={"text": "Текст"})
+    user_client.post(f"/posts/{post.id}/comment", data={"text": "Ещё"})
+    assert _count(post) == 2, (
+        "Убедитесь, что создание комментария увеличивает "
+        "`Post.comment_count`."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _count(post) == 1, (
+        "Убедитесь, что удаление комментария уменьшает "
+        "`Post.comment_count`."
+    )
+
+
+def test_comment_count_follows_bulk_delete(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Comment.objects.filter(post=post).delete()
+    assert _count(post) == 0
+
+
+def test_recount_comments_fixes_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments")
+    assert _count(post) == 2
+
+
+def test_stale_post_save_keeps_comment_count(
+        mixer, post_with_published_location
+):
+    stale = Post.objects.get(pk=post_with_published_location.id)
+    mixer.cycle(3).blend("blog.Comment", post=stale)
+    stale.title = "Правка"
+    stale.save()
+    assert _count(stale) == 3, (
+        "Убедитесь, что сохранение поста, загруженного до новых "
+        "комментариев, не перезаписывает `Post.comment_count`."
+    )
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _revalidate(client, url):
+    etag = client.get(url)["ETag"]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, [
+        query["sql"] for query in queries.captured_queries
+        if '"blog_post"' in query["sql"] or '"blog_comment"' in query["sql"]
+    ]
+
+
+def test_unchanged_pages_answer_not_modified(
+        user_client, user, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{post.id}/",
+    ):
+        response, post_queries = _revalidate(user_client, url)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что `{url}` отвечает 304 на актуальный ETag."
+        )
+        assert not response.content
+        assert not post_queries, (
+            "Убедитесь, что ответ 304 не читает посты и комментарии из БД."
+        )
+
+
+@pytest.mark.parametrize("url", ["/", "/posts/{post.id}/"])
+def test_changes_invalidate_etag(
+        user_client, another_user_client, post_with_published_location, url
+):
+    post = post_with_published_location
+    url = url.format(post=post)
+    etag = user_client.get(url)["ETag"]
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+    assert another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == HTTPStatus.OK, (
+        "Убедитесь, что ETag зависит от пользователя: шапка у всех разная."
+    )
+
+    user_client.post(f"/posts/{post.id}/comment", {"text": "Новый"})
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag ленты и поста."
+    )
+    etag = response["ETag"]
+
+    post.location.name = "Новое место"
+    post.location.save()
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что правка местоположения меняет ETag."
+
+
+def test_etag_changes_after_new_login(
+        user_client, user, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+
+    user_client.logout()
+    user_client.force_login(user)
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после нового входа страница с формой не отдаётся "
+        "ответом 304 со старым CSRF-токеном."
+    )
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _export(*args):
+    out, err = StringIO(), StringIO()
+    call_command("export_data", *args, stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+def test_ndjson_export_streams_rows_in_pk_order(
+        many_posts_with_published_locations
+):
+    out, err = _export("posts", "--chunk-size", "3")
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [row["id"] for row in rows] == list(
+        Post.objects.order_by("pk").values_list("pk", flat=True)
+    )
+    assert {"title", "author_id", "category_id", "updated_at"} <= set(rows[0])
+    assert f"posts: {len(rows)}" in err
+
+
+def test_csv_export_of_users_has_no_passwords(user):
+    out, _ = _export("users", "--format", "csv")
+    header, *rows = list(csv.reader(StringIO(out)))
+    assert "password" not in header
+    assert [user.username] == [row[header.index("username")] for row in rows]
+
+
+def test_gzip_export_to_directory_since_timestamp(
+        tmp_path, many_posts_with_published_locations, comment
+):
+    posts = many_posts_with_published_locations
+    since = timezone.now() + timedelta(minutes=1)
+    Post.objects.filter(pk=posts[0].id).update(
+        updated_at=since + timedelta(minutes=1)
+    )
+
+    _, err = _export(
+        "--output-dir", str(tmp_path), "--gzip", "--since", since.isoformat()
+    )
+    with gzip.open(tmp_path / "posts.ndjson.gz", "rt") as stream:
+        exported = [json.loads(line)["id"] for line in stream]
+    assert exported == [posts[0].id], (
+        "Убедитесь, что --since выгружает только изменённые строки."
+    )
+    assert (tmp_path / "comments.ndjson.gz").exists()
+    assert "--since" in err
+
+
+def test_several_exports_need_output_dir():
+    with pytest.raises(CommandError):
+        _export("posts", "comments")
+    with pytest.raises(CommandError):
+        _export("posts", "--since", "вчера")
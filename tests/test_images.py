@@ -0,0 +1,239 @@
+import os
+from io import BytesIO
+from unittest import mock
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image
+
+from blog.images import (
+    collect_orphan_images,
+    derivative_names,
+    run_due_image_jobs,
+    run_image_job,
+)
+from blog.models import (
+    ImageJob,
+    ImageStatus,
+    Post,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BACKGROUND_TASKS_EAGER = True
+    return tmp_path
+
+
+def test_post_image_derivatives_are_used_in_feed(
+        media_root, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    job = ImageJob.objects.get(post_id=post.id)
+    card = BeautifulSoup(user_client.get("/").content, "html.parser")
+    assert not card.find("picture")
+
+    run_image_job(job.pk)
+    post.refresh_from_db()
+    assert post.image_status == ImageStatus.READY
+    storage = post.image.storage
+    assert all(storage.exists(name) for name in derivative_names(post.image.name))
+
+    page = BeautifulSoup(user_client.get("/").content, "html.parser")
+    picture = page.find("picture")
+    assert picture, (
+        "Убедитесь, что после обработки изображения карточка поста "
+        "выводит <picture> с уменьшенными копиями."
+    )
+    assert picture.find("source", type="image/webp")["srcset"]
+    img = picture.find("img")
+    assert img["loading"] == "lazy" and "320w" in img["srcset"]
+
+
+def test_stale_post_save_keeps_image_status(
+        media_root, post_with_published_location
+):
+    job = ImageJob.objects.get(post_id=post_with_published_location.id)
+    stale = Post.objects.get(pk=post_with_published_location.id)
+    assert stale.image_status == ImageStatus.PENDING
+    run_image_job(job.pk)
+    stale.title = "Правка"
+    stale.save()
+    assert Post.objects.get(pk=stale.pk).image_status == ImageStatus.READY, (
+        "Убедитесь, что правка поста не возвращает статус обработки фото, "
+        "загруженный до окончания фоновой задачи."
+    )
+
+
+def test_image_job_is_retried_then_failed(
+        settings, media_root, post_with_published_location
+):
+    settings.IMAGE_JOB_MAX_ATTEMPTS = 2
+    post = post_with_published_location
+    job = ImageJob.objects.get(post_id=post.id)
+    with mock.patch(
+            "blog.images.generate_derivatives", side_effect=OSError("disk")
+    ):
+        run_image_job(job.pk)
+        job.refresh_from_db()
+        assert job.status == ImageStatus.PENDING and job.attempts == 1
+        assert job.run_after > timezone.now()
+
+        ImageJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        assert run_due_image_jobs() == 1
+    job.refresh_from_db()
+    assert job.status == ImageStatus.FAILED and "disk" in job.last_error
+    assert Post.objects.get(pk=post.pk).image_status == ImageStatus.FAILED
+
+
+def _jpeg(name):
+    img = Image.new("RGB", (40, 40), color=(10, 20, 30))
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG")
+    return ImageFile(buffer, name=name)
+
+
+def test_same_upload_is_stored_once_and_collected(
+        settings, media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    settings.IMAGE_ORPHAN_GRACE = 0
+    first, second = mixer.cycle(2).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        image=mixer.sequence(_jpeg("a.jpg"), _jpeg("b.jpg")),
+    )
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые файлы сохраняются под одним именем."
+    )
+    storage = first.image.storage
+    assert storage.exists(first.image.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert storage.exists(second.image.name)
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not storage.exists(second.image.name)
+
+
+def test_recent_reupload_is_not_collected(
+        settings, media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=_jpeg("a.jpg"),
+    )
+    name = post.image.name
+    storage = post.image.storage
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert storage.exists(name), (
+        "Убедитесь, что только что загруженный файл не удаляется сразу: "
+        "пост с той же загрузкой мог ещё не сохраниться."
+    )
+
+    settings.IMAGE_ORPHAN_GRACE = 0
+    assert collect_orphan_images() == 1
+    assert not storage.exists(name)
+
+
+def test_upload_during_release_keeps_file(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=_jpeg("a.jpg"),
+    )
+    name = post.image.name
+    storage = post.image.storage
+
+    def upload_same_bytes(name):
+        # Параллельная загрузка того же файла, её пост ещё не сохранён.
+        assert storage.save("birthdays_images/b.jpg", _jpeg("b.jpg")) == name
+        return False
+
+    assert storage.delete_unused(name, upload_same_bytes, grace=0)
+    assert storage.exists(name), (
+        "Убедитесь, что загрузка того же файла во время удаления "
+        "не остаётся без файла."
+    )
+
+
+def test_reupload_refreshes_file_time(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=_jpeg("a.jpg"),
+    )
+    storage = post.image.storage
+    path = storage.path(post.image.name)
+    os.utime(path, (0, 0))
+    storage.save("birthdays_images/b.jpg", _jpeg("b.jpg"))
+    assert not storage.delete_unused(
+        post.image.name, lambda name: False, grace=60
+    ), "Убедитесь, что повторная загрузка защищает файл от удаления."
+
+
+def test_collect_keeps_legacy_images_and_thumbs(
+        settings, media_root, post_with_published_location
+):
+    settings.IMAGE_ORPHAN_GRACE = 0
+    legacy = "birthdays_images/legacy.jpg"
+    storage = default_storage
+    storage.save(legacy, _jpeg("legacy.jpg"))
+    for name in derivative_names(legacy):
+        storage.save(name, _jpeg("thumb.jpg"))
+    Post.objects.filter(pk=post_with_published_location.id).update(
+        image=legacy
+    )
+
+    collect_orphan_images()
+    assert storage.exists(legacy)
+    assert all(storage.exists(name) for name in derivative_names(legacy)), (
+        "Убедитесь, что сборка не удаляет копии фото, загруженных до "
+        "адресации по содержимому."
+    )
+
+
+def test_any_image_change_is_scheduled(
+        media_root, post_with_published_location
+):
+    post = Post.objects.get(pk=post_with_published_location.id)
+    jobs = ImageJob.objects.filter(post=post)
+    assert jobs.count() == 1
+    Post.objects.filter(pk=post.pk).update(image_status=ImageStatus.READY)
+
+    post.image = _jpeg("other.jpg")
+    post.save()
+    assert jobs.count() == 2, (
+        "Убедитесь, что новое фото ставится в очередь при любом "
+        "сохранении поста, а не только из формы."
+    )
+    assert Post.objects.get(pk=post.pk).image_status == ImageStatus.PENDING
+
+    post.title = "Без нового фото"
+    post.save()
+    assert jobs.count() == 2
+
+
+def test_stale_post_save_keeps_processed_image(
+        media_root, post_with_published_location
+):
+    stale = Post.objects.get(pk=post_with_published_location.id)
+    # Обработка заменила оригинал с EXIF очищенным файлом.
+    Post.objects.filter(pk=stale.pk).update(image="birthdays_images/x.jpg")
+    stale.title = "Правка"
+    stale.save()
+    assert Post.objects.get(pk=stale.pk).image.name == (
+        "birthdays_images/x.jpg"
+    ), "Убедитесь, что правка поста не возвращает имя исходного фото."
@@ -0,0 +1,137 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.search import get_backend
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def small_chunks(settings):
+    settings.MODERATION_CHUNK_SIZE = 3
+
+
+@pytest.fixture
+def moderation_log(caplog):
+    logger = logging.getLogger("blogicum.moderation")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def _run_action(client, model, action, ids, **extra):
+    return client.post(f"/admin/blog/{model}/", {
+        "action": action,
+        "_selected_action": [str(pk) for pk in ids],
+        **extra,
+    })
+
+
+def test_unpublish_and_recategorize_in_chunks(
+        admin_client, user_client, small_chunks, moderation_log,
+        django_capture_on_commit_callbacks,
+        many_posts_with_published_locations, another_category
+):
+    posts = sorted(
+        many_posts_with_published_locations, key=lambda post: post.pub_date,
+        reverse=True,
+    )
+    ids = [post.id for post in posts]
+    title = posts[0].title
+    assert title in user_client.get("/").content.decode()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = _run_action(admin_client, "post", "unpublish", ids)
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Post.objects.filter(pk__in=ids, is_published=True).exists()
+    assert title not in user_client.get("/").content.decode(), (
+        "Убедитесь, что после массового снятия с публикации кэш лент "
+        "сброшен."
+    )
+    progress = [
+        record.getMessage() for record in moderation_log.records
+        if record.name == "blogicum.moderation"
+    ]
+    assert len(progress) == -(-len(ids) // 3), (
+        "Убедитесь, что действие обрабатывает выборку частями и пишет "
+        "о ходе работы в лог."
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _run_action(admin_client, "post", "publish", ids[:1])
+        _run_action(
+            admin_client, "post", "recategorize", ids[:1],
+            category=str(another_category.id),
+        )
+    content = user_client.get(
+        f"/category/{another_category.slug}/"
+    ).content.decode()
+    assert title in content
+
+
+def test_bulk_delete_posts_keeps_index_and_feeds_consistent(
+        admin_client, user_client, small_chunks,
+        django_capture_on_commit_callbacks,
+        many_posts_with_published_locations, mixer
+):
+    posts = sorted(
+        many_posts_with_published_locations, key=lambda post: post.pub_date,
+        reverse=True,
+    )
+    spam, kept = posts[:4], posts[4]
+    for post in spam:
+        mixer.cycle(2).blend("blog.Comment", post=post, text="Спамоваяссылка")
+    spam_ids = [post.id for post in spam]
+    user_client.get("/")
+
+    response = _run_action(admin_client, "post", "delete_in_chunks", spam_ids)
+    assert response.status_code == HTTPStatus.OK
+    assert "Будет удалено: 4" in response.content.decode()
+    assert Post.objects.filter(pk__in=spam_ids).count() == 4
+
+    with django_capture_on_commit_callbacks(execute=True), (
+        CaptureQueriesContext(connection)
+    ) as queries:
+        response = _run_action(
+            admin_client, "post", "delete_in_chunks", spam_ids, post="yes"
+        )
+    assert response.status_code == HTTPStatus.FOUND
+    comment_deletes = [
+        query["sql"] for query in queries.captured_queries
+        if query["sql"].startswith('DELETE FROM "blog_comment"')
+    ]
+    # Посты идут частями 3 + 1 с 6 и 2 комментариями: 2 + 1 удаления.
+    assert len(comment_deletes) == 3, (
+        "Убедитесь, что комментарии удаляемых постов удаляются частями."
+    )
+    assert not Post.objects.filter(pk__in=spam_ids).exists()
+    assert not Comment.objects.filter(post_id__in=spam_ids).exists()
+    assert not get_backend().filter_comments(
+        Comment.objects.all(), "Спамоваяссылка"
+    ).exists()
+    content = user_client.get("/").content.decode()
+    assert kept.title in content
+    assert all(post.title not in content for post in spam)
+
+
+def test_bulk_delete_comments_syncs_counters(
+        admin_client, small_chunks, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    ids = [comment.id for comment in comments[:4]]
+
+    _run_action(admin_client, "comment", "delete_in_chunks", ids, post="yes")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что массовое удаление комментариев пересчитывает "
+        "счётчик комментариев поста."
+    )
+    assert list(Comment.objects.values_list("id", flat=True)) == [
+        comments[4].id
+    ]
@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _walk_cursor_pages(client, url):
+    seen = []
+    response = client.get(url, {"cursor": ""})
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        assert len(page) <= N_PER_PAGE
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            return seen, page
+        response = client.get(url, {"cursor": page.next_cursor})
+
+
+def test_cursor_pagination_walks_whole_feed(
+        user_client, many_posts_with_published_locations
+):
+    seen, last_page = _walk_cursor_pages(user_client, "/")
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что курсорная пагинация обходит ленту без пропусков и "
+        "повторов в порядке убывания даты публикации."
+    )
+
+    response = user_client.get("/", {"cursor": last_page.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == (
+        seen[-2 * N_PER_PAGE:-N_PER_PAGE]
+    )
+
+
+def test_cursor_pagination_rejects_broken_token(user_client):
+    response = user_client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@override_settings(POSTS_CURSOR_PAGINATION=True)
+def test_offset_links_keep_working_in_cursor_mode(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get("/", {"page": 2})
+    assert response.context["page_obj"].number == 2
+    response = user_client.get("/")
+    assert response.context["page_obj"].is_cursor
+    assert b"?cursor=" in response.content
+
+
+def test_comment_thread_is_paginated(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    per_page = settings.MAX_COMMENTS_LIMIT
+    mixer.cycle(per_page + 3).blend("blog.Comment", post=post)
+
+    response = user_client.get(f"/posts/{post.id}/")
+    first_page = response.context["comments"]
+    assert len(first_page) == per_page
+    assert first_page.has_next()
+
+    response = user_client.get(
+        f"/posts/{post.id}/comments/", {"cursor": first_page.next_cursor}
+    )
+    assert response.status_code == HTTPStatus.OK
+    rest = response.context["comments"]
+    assert len(rest) == 3 and not rest.has_next()
+    assert b"<html" not in response.content
+    ids = [comment.id for comment in [*first_page, *rest]]
+    assert ids == list(
+        post.comments.order_by("created_at", "id").values_list("id", flat=True)
+    )
+
+
+def _count_queries_run(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    return sum("COUNT(" in query["sql"] for query in queries)
+
+
+def test_feed_count_is_cached_until_posts_change(
+        mixer, user, user_client, many_posts_with_published_locations
+):
+    _count_queries_run(user_client, "/")
+    assert _count_queries_run(user_client, "/?page=2") == 0, (
+        "Убедитесь, что общее число постов ленты берётся из кэша."
+    )
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=many_posts_with_published_locations[0].category,
+    )
+    assert _count_queries_run(user_client, "/") == 1
+    response = user_client.get("/")
+    assert response.context["page_obj"].paginator.count == (
+        len(many_posts_with_published_locations) + 1
+    )
+
+
+def test_paginator_renders_windowed_page_range(
+        mixer, user_client, published_category, user
+):
+    mixer.cycle(N_PER_PAGE * 30).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now(),
+    )
+    response = user_client.get("/", {"page": 15})
+    assert response.status_code == HTTPStatus.OK
+    links = response.content.decode().count('class="page-link"')
+    assert links < 20, (
+        "Убедитесь, что пагинатор выводит окно страниц, а не ссылку на "
+        "каждую страницу."
+    )
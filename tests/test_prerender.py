@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pages.prerender import render_pages
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def prerendered(settings, tmp_path):
+    settings.PRERENDERED_PAGES = True
+    settings.PRERENDER_ROOT = tmp_path
+    call_command("prerender_pages", verbosity=0)
+    return tmp_path
+
+
+def test_static_pages_served_without_templates_or_db(client, prerendered):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/pages/about/")
+    assert response.status_code == HTTPStatus.OK
+    assert not response.templates and not queries, (
+        "Убедитесь, что страница «О проекте» отдаётся из заранее "
+        "отрисованного HTML без шаблонов и запросов к БД."
+    )
+    content = response.content.decode()
+    assert "Блогикум — это дом для творческих людей" in content
+    assert "Войти" in content and "@@" not in content
+
+
+def test_prerendered_header_shows_current_user(user, user_client, prerendered):
+    content = user_client.get("/pages/rules/").content.decode()
+    assert f'href="/profile/{user.username}/">{user.username}</a>' in content
+    assert "Выйти" in content and "Войти" not in content
+
+
+def test_prerendered_404_keeps_requested_address(client, prerendered):
+    response = client.get("/no-such-page/?a=1&b=2")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not response.templates
+    content = response.content.decode()
+    assert "http://testserver/no-such-page/?a=1&amp;b=2" in content
+
+
+def test_pages_fall_back_to_templates_without_files(
+        client, settings, tmp_path
+):
+    settings.PRERENDERED_PAGES = True
+    settings.PRERENDER_ROOT = tmp_path
+    response = client.get("/pages/about/")
+    assert response.status_code == HTTPStatus.OK
+    assert "pages/about.html" in [t.name for t in response.templates]
+
+
+def test_pages_prerendered_after_first_miss_are_served(
+        client, settings, tmp_path
+):
+    settings.PRERENDERED_PAGES = True
+    settings.PRERENDER_ROOT = tmp_path
+    response = client.get("/pages/about/")
+    assert "pages/about.html" in [t.name for t in response.templates]
+
+    # Файлы пишет другой процесс: кэш чтения этого процесса не сброшен.
+    for name, html in render_pages().items():
+        (tmp_path / f"{name}.html").write_text(html, encoding="utf-8")
+    response = client.get("/pages/about/")
+    assert response.status_code == HTTPStatus.OK
+    assert not response.templates, (
+        "Убедитесь, что отсутствие файла не запоминается и страница, "
+        "отрисованная позже, отдаётся из готового HTML."
+    )
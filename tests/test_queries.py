@@ -0,0 +1,168 @@
+import logging
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import (
+    RequestFactory,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+
+from blog import views
+from blog.models import Comment
+from core.middleware import QueryBudgetExceeded
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _table_plan(queryset, table):
+    plan = queryset.explain()
+    lines = [
+        line for line in plan.splitlines()
+        if re.search(rf"\b(SCAN|SEARCH)( TABLE)? {table}\b", line)
+    ]
+    assert lines, f"В плане запроса нет обращения к `{table}`:\n{plan}"
+    return plan, lines
+
+
+def _assert_uses_index(queryset, table, index_name):
+    plan, lines = _table_plan(queryset, table)
+    assert any(index_name in line for line in lines), (
+        f"Убедитесь, что запрос к `{table}` использует индекс "
+        f"`{index_name}`, а не полный просмотр таблицы:\n{plan}"
+    )
+
+
+def _view_queryset(view_cls, user, **kwargs):
+    request = RequestFactory().get("/")
+    request.user = user
+    attrs = kwargs.pop("_attrs", {})
+    view = view_cls()
+    view.setup(request, **kwargs)
+    for attr, value in attrs.items():
+        setattr(view, attr, value)
+    return view.get_queryset()[:10]
+
+
+def test_index_feed_uses_index(user):
+    _assert_uses_index(
+        _view_queryset(views.IndexListView, user),
+        "blog_post",
+        "post_published_pub_date_idx",
+    )
+
+
+def test_category_feed_uses_index(user, published_category):
+    queryset = _view_queryset(
+        views.CategoryListView,
+        user,
+        category_slug=published_category.slug,
+        _attrs={"category": published_category},
+    )
+    _assert_uses_index(queryset, "blog_post", "post_category_pub_date_idx")
+
+
+def test_profile_feed_uses_index(user):
+    queryset = _view_queryset(
+        views.ProfileDetailView,
+        user,
+        username=user.username,
+        _attrs={"user_obj": user},
+    )
+    _assert_uses_index(queryset, "blog_post", "post_author_pub_date_idx")
+
+
+def test_post_comments_use_index(post_with_published_location):
+    _assert_uses_index(
+        Comment.objects.filter(post=post_with_published_location),
+        "blog_comment",
+        "comment_post_created_at_idx",
+    )
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(queries)
+
+
+def test_post_detail_queries_do_not_grow_with_comments(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    mixer.blend("blog.Comment", post=post)
+    few = _count_queries(user_client, url)
+    mixer.cycle(10).blend("blog.Comment", post=post)
+    many = _count_queries(user_client, url)
+    assert many == few, (
+        "Убедитесь, что число запросов страницы поста не зависит от "
+        "количества комментариев: авторов нужно загружать вместе с ними."
+    )
+
+
+def _count_selects_from(client, method, url, table):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(url)
+    assert response.status_code in (HTTPStatus.OK, HTTPStatus.FOUND)
+    return sum(
+        1 for query in queries.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    )
+
+
+@pytest.mark.parametrize("method", ["get", "post"])
+def test_post_edit_fetches_post_once(
+        method, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    selects = _count_selects_from(
+        user_client, method, f"/posts/{post.id}/edit/", "blog_post"
+    )
+    assert selects == 1, (
+        "Убедитесь, что при редактировании пост загружается из базы "
+        "один раз: проверка прав и view должны использовать один объект."
+    )
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_views_fetch_comment_once(
+        action, user_client, user, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    for method in ("get", "post"):
+        selects = _count_selects_from(
+            user_client,
+            method,
+            f"/posts/{post.id}/{action}/{comment.id}/",
+            "blog_comment",
+        )
+        assert selects == 1
+
+
+def test_query_budget_middleware_logs_view_stats(
+        caplog, user_client, post_with_published_location
+):
+    logger = logging.getLogger("blogicum.queries")
+    logger.addHandler(caplog.handler)
+    try:
+        user_client.get("/")
+    finally:
+        logger.removeHandler(caplog.handler)
+    assert any(
+        record.getMessage().startswith("view=blog:index ")
+        and "queries=" in record.getMessage()
+        and "render_ms=" in record.getMessage()
+        for record in caplog.records
+    )
+
+
+def test_query_budget_is_enforced(user_client):
+    with override_settings(QUERY_BUDGETS={"blog:index": 0}):
+        with pytest.raises(QueryBudgetExceeded):
+            user_client.get("/")
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+from django.utils import timezone
+
+from blog.caching import SCHEDULE_KEY, reset_schedule
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Второй файл SQLite в роли реплики, подключённый на время теста."""
+    alias = settings.REPLICA_DATABASE
+    connections.databases[alias] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    connections.ensure_defaults(alias)
+    connections.prepare_test_settings(alias)
+    yield alias
+    connections[alias].close()
+    del connections[alias]
+    del connections.databases[alias]
+
+
+def test_reads_go_to_replica_until_own_write(
+        user_client, post_with_published_location, replica
+):
+    post = post_with_published_location
+    call_command("sync_replica", verbosity=0)
+    url = f"/posts/{post.id}/"
+
+    response = user_client.post(
+        f"{url}comment", {"text": "Свежий комментарий"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert "use_primary" in response.cookies
+    assert "Свежий комментарий" in user_client.get(url).content.decode(), (
+        "Убедитесь, что после своей записи клиент читает из основной БД."
+    )
+
+    anonymous = Client()
+    assert "Свежий комментарий" not in anonymous.get(url).content.decode(), (
+        "Убедитесь, что страница поста читает из реплики."
+    )
+    call_command("sync_replica", verbosity=0)
+    assert "Свежий комментарий" in anonymous.get(url).content.decode()
+
+
+def test_writes_and_other_views_use_primary(
+        user_client, post_with_published_location, replica
+):
+    post = post_with_published_location
+    call_command("sync_replica", verbosity=0)
+    replicated_title = post.title
+    post.title = "Только в основной БД"
+    post.save()
+    assert post._state.db == "default"
+
+    response = user_client.get(f"/posts/{post.id}/edit/")
+    assert response.context["form"].instance.title == "Только в основной БД"
+    response = Client().get(f"/posts/{post.id}/")
+    assert response.context["post"].title == replicated_title
+
+
+def test_feed_cache_is_not_filled_from_replica(
+        mixer, user_client, post_with_published_location, replica
+):
+    post = post_with_published_location
+    call_command("sync_replica", verbosity=0)
+    mixer.blend(
+        "blog.Post", title="Только в основной БД", author=post.author,
+        category=post.category, location=post.location,
+        pub_date=post.pub_date, is_published=True,
+    )
+
+    assert "Только в основной БД" not in Client().get("/").content.decode()
+    user_client.cookies["use_primary"] = "1"
+    assert "Только в основной БД" in user_client.get(
+        "/"
+    ).content.decode(), (
+        "Убедитесь, что состав ленты, прочитанный из реплики, не попадает "
+        "в кэш под новой версией ленты."
+    )
+
+
+def test_lagging_replica_page_gets_no_etag(
+        user_client, post_with_published_location, replica
+):
+    post = post_with_published_location
+    call_command("sync_replica", verbosity=0)
+    url = f"/posts/{post.id}/"
+    user_client.post(f"{url}comment", {"text": "Свежий комментарий"})
+
+    anonymous = Client()
+    response = anonymous.get(url)
+    assert "Свежий комментарий" not in response.content.decode()
+    assert "ETag" not in response, (
+        "Убедитесь, что страница из отстающей реплики не получает ETag "
+        "по уже новым версиям кэша."
+    )
+    call_command("sync_replica", verbosity=0)
+    assert "Свежий комментарий" in anonymous.get(url).content.decode()
+
+
+def test_lagging_replica_cards_are_not_cached(
+        user, post_with_published_location, replica
+):
+    call_command("sync_replica", verbosity=0)
+    user.username = "new_name"
+    user.save()
+
+    anonymous = Client()
+    assert "new_name" not in anonymous.get("/").content.decode()
+    call_command("sync_replica", verbosity=0)
+    assert "new_name" in anonymous.get("/").content.decode(), (
+        "Убедитесь, что карточки из реплики не кэшируются под новой "
+        "версией автора."
+    )
+
+
+def test_schedule_watermark_is_read_from_primary(
+        mixer, post_with_published_location, replica
+):
+    post = post_with_published_location
+    call_command("sync_replica", verbosity=0)
+    scheduled = mixer.blend(
+        "blog.Post", author=post.author, category=post.category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=5),
+    )
+    reset_schedule()
+
+    Client().get("/")
+    assert cache.get(SCHEDULE_KEY)["next_pub_date"] == scheduled.pub_date, (
+        "Убедитесь, что дата ближайшей отложенной публикации берётся "
+        "из основной БД, а не из отстающей реплики."
+    )
@@ -0,0 +1,108 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import get_backend
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return response.context["page_obj"]
+
+
+@pytest.fixture
+def search_posts(mixer, user, published_category):
+    def blend(title, text="", **fields):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now(),
+            **fields,
+        }
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+    return blend
+
+
+def test_search_ranks_title_matches_and_hides_drafts(
+        user_client, search_posts
+):
+    in_text = search_posts("Прогулка", "Встретили рыжего кота у реки")
+    in_title = search_posts("Коты нашего двора", "Истории соседей")
+    search_posts("Черновик про котов", is_published=False)
+
+    page = _search(user_client, "кот")
+    assert [post.id for post in page] == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит слова по префиксу, ставит совпадения "
+        "в заголовке выше и не показывает неопубликованные посты."
+    )
+
+
+def test_search_finds_posts_by_comments_and_follows_edits(
+        mixer, user_client, search_posts
+):
+    post = search_posts("Выходные", "Ничего особенного")
+    comment = mixer.blend("blog.Comment", post=post, text="Отличный пейзаж")
+    assert [p.id for p in _search(user_client, "пейзаж")] == [post.id]
+
+    comment.text = "Отличный закат"
+    comment.save()
+    assert not _search(user_client, "пейзаж")
+    comment.delete()
+    assert not _search(user_client, "закат")
+
+    post.title = "Горный поход"
+    post.save()
+    assert [p.id for p in _search(user_client, "горный")] == [post.id]
+    post.delete()
+    assert not _search(user_client, "горный")
+
+
+def test_search_keyset_pagination(user_client, search_posts, settings):
+    posts = [
+        search_posts(f"Заметка {i}", "про велосипед")
+        for i in range(settings.MAX_POSTS_LIMIT + 3)
+    ]
+    seen = []
+    page = _search(user_client, "велосипед")
+    while True:
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            break
+        page = _search(user_client, "велосипед", cursor=page.next_cursor)
+    assert sorted(seen) == sorted(post.id for post in posts)
+    assert len(seen) == len(set(seen))
+
+    response = user_client.get("/search/", {"q": "x", "cursor": "broken"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@override_settings(SEARCH_BACKEND="blog.search.SearchBackend")
+def test_fallback_backend_without_index(mixer, user_client, search_posts):
+    post = search_posts("Рецепт", "Пирог с яблоками")
+    mixer.blend("blog.Comment", post=post, text="Попробую испечь")
+    assert [p.id for p in _search(user_client, "яблок")] == [post.id]
+    assert [p.id for p in _search(user_client, "испечь")] == [post.id]
+    assert not _search(user_client, "!!!")
+
+
+def test_admin_search_uses_index(admin_client, mixer, search_posts):
+    post = search_posts("Осенний лес", "Листья")
+    search_posts("Зимний лес")
+    comment = mixer.blend("blog.Comment", post=post, text="Красивые листья")
+
+    response = admin_client.get("/admin/blog/post/", {"q": "осен"})
+    assert list(response.context["cl"].result_list) == [post]
+    response = admin_client.get("/admin/blog/comment/", {"q": "красив"})
+    assert list(response.context["cl"].result_list) == [comment]
+
+    assert list(
+        get_backend().filter_posts(Post.objects.all(), "лес")
+        .order_by("id")
+    ) == list(Post.objects.order_by("id"))
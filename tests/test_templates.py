@@ -0,0 +1,55 @@
+import pytest
+from django.template import engines
+from django.test import override_settings
+
+from core.template_warmup import warm_templates
+
+CACHED_TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": engines["django"].engine.dirs,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+            ],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+
+def test_warm_templates_fills_cached_loader():
+    with override_settings(TEMPLATES=CACHED_TEMPLATES):
+        warmed, errors = warm_templates()
+        assert not errors
+        loader = engines["django"].engine.template_loaders[0]
+        cached = {key.split("-")[0] for key in loader.get_template_cache}
+        for name in (
+            "base.html",
+            "includes/post_card.html",
+            "includes/paginator.html",
+            "admin/change_list.html",
+        ):
+            assert name in cached, (
+                f"Убедитесь, что прогрев разбирает шаблон `{name}`."
+            )
+        assert warmed == len(cached)
+
+
+@pytest.mark.django_db
+def test_post_card_renders_category_link_inline(
+        client, post_with_published_location
+):
+    category = post_with_published_location.category
+    content = client.get("/").content.decode()
+    assert f'href="/category/{category.slug}/"' in content
+    assert category.title in content
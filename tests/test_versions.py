@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Post
+from core.models import cache_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _reload(post):
+    return Post.objects.get(pk=post.pk)
+
+
+def test_save_and_update_bump_version(post_with_published_location):
+    post = post_with_published_location
+    assert post.version == 1
+    first_key = cache_key("card", post, post.category, post.location)
+
+    post.title = "Правка"
+    post.save()
+    assert post.version == _reload(post).version == 2
+
+    post.save(update_fields=["title"])
+    saved = _reload(post)
+    assert saved.version == 3 and saved.updated_at > post.created_at, (
+        "Убедитесь, что save(update_fields=...) тоже меняет версию."
+    )
+
+    Post.objects.filter(pk=post.pk).update(title="Массово")
+    updated = _reload(post)
+    assert updated.version == 4, (
+        "Убедитесь, что QuerySet.update() увеличивает версию строк."
+    )
+    assert updated.updated_at > saved.updated_at
+
+    assert cache_key(
+        "card", updated, updated.category, updated.location
+    ) != first_key
+    assert cache_key("card", updated, None).endswith(":none")
+
+
+def test_stale_save_does_not_move_version_back(
+        post_with_published_location
+):
+    stale = Post.objects.get(pk=post_with_published_location.id)
+    for title in ("Один", "Два", "Три"):
+        Post.objects.filter(pk=stale.pk).update(title=title)
+    assert _reload(stale).version == 4
+
+    stale.save()
+    assert stale.version == _reload(stale).version == 5, (
+        "Убедитесь, что сохранение устаревшего экземпляра увеличивает "
+        "версию строки в БД, а не версию из памяти."
+    )
+
+
+def test_admin_list_editable_bumps_version(
+        admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = admin_client.post("/admin/blog/post/", {
+        "form-TOTAL_FORMS": "1",
+        "form-INITIAL_FORMS": "1",
+        "form-0-id": str(post.pk),
+        "form-0-pub_date_0": post.pub_date.strftime("%Y-%m-%d"),
+        "form-0-pub_date_1": post.pub_date.strftime("%H:%M:%S"),
+        "form-0-category": str(post.category_id),
+        "_save": "Сохранить",
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    saved = _reload(post)
+    assert not saved.is_published
+    assert saved.version == post.version + 1, (
+        "Убедитесь, что правка в списке админки меняет версию поста."
+    )